@@ -1,6 +1,26 @@
 import heapq
 import math
 
+def reconstruire_chemin(parents, fin):
+    """
+    Reconstruit un chemin à partir des prédécesseurs enregistrés pendant une recherche.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - parents : Dictionnaire associant à chaque sommet atteint son prédécesseur (None pour le départ).
+    - fin : Le sommet d'arrivée.
+    ------------------------------------------------------------------------------------------------
+    Garder un prédécesseur par sommet plutôt qu'une copie du chemin dans chaque entrée du tas
+    fait passer la mémoire de la recherche de O(n x longueur du chemin) à O(n).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - La liste des sommets du départ jusqu'à fin.
+    """
+    chemin = []
+    while fin is not None:
+        chemin.append(fin)
+        fin = parents[fin]
+    return chemin[::-1]
+
 def dijkstra(laby, start, end):
     """
     Implémente l'algorithme de Dijkstra pour trouver le chemin le plus court entre deux sommets.
@@ -17,17 +37,17 @@ def dijkstra(laby, start, end):
     - Une liste représentant le chemin le plus court entre start et end, s'il existe.
     - None si aucun chemin n'est trouvé.
     """
-    tas = [(0, start, [])]
+    tas = [(0, start)]
     deja_vu = set()
     minis = {start: 0}
+    parents = {start: None}
     while tas:
-        (cout, v1, chemin) = heapq.heappop(tas)
+        (cout, v1) = heapq.heappop(tas)
         if v1 in deja_vu:
             continue
         deja_vu.add(v1)
-        chemin = chemin + [v1]
         if v1 == end:
-            return chemin
+            return reconstruire_chemin(parents, end)
         for v2 in laby.voisins(v1):
             if v2 in deja_vu:
                 continue
@@ -35,7 +55,8 @@ def dijkstra(laby, start, end):
             suivant = cout + 1  # Assuming all edges have weight 1
             if precedent is None or suivant < precedent:
                 minis[v2] = suivant
-                heapq.heappush(tas, (suivant, v2, chemin))
+                parents[v2] = v1
+                heapq.heappush(tas, (suivant, v2))
     return None
 
 def heuristique(a, b, laby):
@@ -56,7 +77,7 @@ def heuristique(a, b, laby):
     (x2, y2) = (b % laby.l, b // laby.l)
     return abs(x1 - x2) + abs(y1 - y2)
 
-def astar(laby, start, end):
+def astar(laby, start, end, estimation=heuristique):
     """
     Implémente l'algorithme A* pour trouver le chemin le plus court entre deux sommets.
     ------------------------------------------------------------------------------------------------
@@ -64,6 +85,7 @@ def astar(laby, start, end):
     - laby : Le graphe représentant le labyrinthe.
     - start : Le sommet de départ.
     - end : Le sommet d'arrivée.
+    - estimation : Fonction heuristique (a, b, laby) optionnelle, par défaut la distance de Manhattan.
     ------------------------------------------------------------------------------------------------
     Parcourt les sommets en utilisant un tas (min-heap) pour gérer les sommets à explorer. 
     À chaque étape, la priorité d'exploration est calculée comme la somme de la distance parcourue
@@ -73,17 +95,17 @@ def astar(laby, start, end):
     - Une liste représentant le chemin le plus court entre start et end, s'il existe.
     - None si aucun chemin n'est trouvé.
     """
-    tas = [(0, start, [])]
+    tas = [(0, 0, start)]
     deja_vu = set()
     minis = {start: 0}
+    parents = {start: None}
     while tas:
-        (cout, v1, chemin) = heapq.heappop(tas)
+        (_, cout, v1) = heapq.heappop(tas)
         if v1 in deja_vu:
             continue
         deja_vu.add(v1)
-        chemin = chemin + [v1]
         if v1 == end:
-            return chemin
+            return reconstruire_chemin(parents, end)
         for v2 in laby.voisins(v1):
             if v2 in deja_vu:
                 continue
@@ -91,13 +113,45 @@ def astar(laby, start, end):
             suivant = cout + 1  # On suppose que toutes les arêtes ont un poids de 1
             if precedent is None or suivant < precedent:
                 minis[v2] = suivant
-                priorite = suivant + heuristique(v2, end, laby)
-                heapq.heappush(tas, (priorite, v2, chemin))
+                parents[v2] = v1
+                priorite = suivant + estimation(v2, end, laby)
+                heapq.heappush(tas, (priorite, suivant, v2))
     return None
 
 
 
 
+def trouver_chemin(laby, début, fin):
+    """
+    Trouve un chemin reliant une position de départ à une position finale dans le labyrinthe.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe représenté sous forme de graphe.
+    - début : Le sommet de départ.
+    - fin : Le sommet de fin.
+    ------------------------------------------------------------------------------------------------
+    Renvoie un chemin sous forme de liste de sommets allant de début à fin, ou None si aucun chemin n'existe.
+    """
+    pile = [(début, None)]
+    deja_visite = set()
+    parents = {}
+
+    while pile:
+        (sommet, parent) = pile.pop()
+        if sommet in deja_visite:
+            continue
+        parents[sommet] = parent
+
+        if sommet == fin:
+            return reconstruire_chemin(parents, fin)
+
+        deja_visite.add(sommet)
+        for voisin in laby.voisins(sommet):
+            if voisin not in deja_visite:
+                pile.append((voisin, sommet))
+    return None
+
+
 def dijkstra_etapes(laby, start, end):
     """
     Implémente l'algorithme de Dijkstra tout en collectant les étapes d'exploration.
@@ -113,19 +167,19 @@ def dijkstra_etapes(laby, start, end):
     - Une liste représentant le chemin le plus court entre start et end, s'il existe.
     - Une liste des étapes explorées pendant l'exécution.
     """
-    tas = [(0, start, [])]
+    tas = [(0, start)]
     deja_vu = set()
     minis = {start: 0}
+    parents = {start: None}
     étapes = []  # Pour stocker les étapes explorées
     while tas:
-        (cout, v1, chemin) = heapq.heappop(tas)
+        (cout, v1) = heapq.heappop(tas)
         if v1 in deja_vu:
             continue
         deja_vu.add(v1)
         étapes.append(v1)
-        chemin = chemin + [v1]
         if v1 == end:
-            return chemin, étapes
+            return reconstruire_chemin(parents, end), étapes
         for v2 in laby.voisins(v1):
             if v2 in deja_vu:
                 continue
@@ -133,11 +187,12 @@ def dijkstra_etapes(laby, start, end):
             suivant = cout + 1  # Assuming all edges have weight 1
             if precedent is None or suivant < precedent:
                 minis[v2] = suivant
-                heapq.heappush(tas, (suivant, v2, chemin))
+                parents[v2] = v1
+                heapq.heappush(tas, (suivant, v2))
     return None, étapes
 
 
-def astar_etapes(laby, start, end):
+def astar_etapes(laby, start, end, estimation=heuristique):
     """
     Implémente l'algorithme A* tout en collectant les étapes d'exploration.
     ------------------------------------------------------------------------------------------------
@@ -145,6 +200,7 @@ def astar_etapes(laby, start, end):
     - laby : Le graphe représentant le labyrinthe.
     - start : Le sommet de départ.
     - end : Le sommet d'arrivée.
+    - estimation : Fonction heuristique (a, b, laby) optionnelle, par défaut la distance de Manhattan.
     ------------------------------------------------------------------------------------------------
     Collecte et enregistre les étapes de chaque sommet exploré pendant l'exécution de l'algorithme.
     ------------------------------------------------------------------------------------------------
@@ -152,19 +208,19 @@ def astar_etapes(laby, start, end):
     - Une liste représentant le chemin le plus court entre start et end, s'il existe.
     - Une liste des étapes explorées pendant l'exécution.
     """
-    tas = [(0, start, [])]
+    tas = [(0, 0, start)]
     deja_vu = set()
     minis = {start: 0}
+    parents = {start: None}
     étapes = []  # Pour stocker les étapes explorées
     while tas:
-        (cout, v1, chemin) = heapq.heappop(tas)
+        (_, cout, v1) = heapq.heappop(tas)
         if v1 in deja_vu:
             continue
         deja_vu.add(v1)
         étapes.append(v1)
-        chemin = chemin + [v1]
         if v1 == end:
-            return chemin, étapes
+            return reconstruire_chemin(parents, end), étapes
         for v2 in laby.voisins(v1):
             if v2 in deja_vu:
                 continue
@@ -172,8 +228,111 @@ def astar_etapes(laby, start, end):
             suivant = cout + 1  # Assuming all edges have weight 1
             if precedent is None or suivant < precedent:
                 minis[v2] = suivant
-                priorite = suivant + heuristique(v2, end, laby)
-                heapq.heappush(tas, (priorite, v2, chemin))
+                parents[v2] = v1
+                priorite = suivant + estimation(v2, end, laby)
+                heapq.heappush(tas, (priorite, suivant, v2))
     return None, étapes
 
 
+def heuristique_multiple(cibles, estimation=heuristique):
+    """
+    Construit l'heuristique vers l'ensemble de cibles le plus proche.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - cibles : Les sommets d'arrivée possibles.
+    - estimation : Heuristique (a, b, laby) vers une seule cible, ou None pour Dijkstra.
+    ------------------------------------------------------------------------------------------------
+    Le minimum d'estimations admissibles (et cohérentes) l'est encore : A* reste optimal
+    vers la cible la plus proche.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une fonction (v, laby) donnant la plus petite estimation de v vers une cible.
+    """
+    if estimation is None:
+        return lambda v, laby: 0
+    cibles = list(cibles)
+    return lambda v, laby: min(estimation(v, t, laby) for t in cibles)
+
+
+def astar_multi_etapes(laby, sources, cibles, estimation=heuristique):
+    """
+    Implémente A* depuis plusieurs sources vers plusieurs cibles, en une seule recherche.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le graphe représentant le labyrinthe.
+    - sources : Les sommets de départ possibles.
+    - cibles : Les sommets d'arrivée possibles.
+    - estimation : Heuristique (a, b, laby) vers une cible, ou None pour Dijkstra.
+    ------------------------------------------------------------------------------------------------
+    Le tas est initialisé avec toutes les sources à distance 0 et la recherche s'arrête à la
+    première cible extraite : c'est la plus proche de l'ensemble des sources. La priorité
+    utilise la plus petite estimation vers les cibles (voir heuristique_multiple). Avec une
+    seule source et une seule cible, le parcours est celui d'astar_etapes.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une liste représentant le plus court chemin d'une source à une cible, s'il existe (None sinon).
+    - Une liste des étapes explorées pendant l'exécution.
+    - Le couple (source, cible) relié par ce chemin, ou None.
+    """
+    cibles = set(cibles)
+    if not cibles or not sources:
+        return None, [], None
+    estimer = heuristique_multiple(cibles, estimation)
+    tas = []
+    minis = {}
+    parents = {}
+    for s in sources:
+        if s not in minis:
+            minis[s] = 0
+            parents[s] = None
+            tas.append((estimer(s, laby), 0, s))
+    heapq.heapify(tas)
+    deja_vu = set()
+    étapes = []
+    while tas:
+        (_, cout, v1) = heapq.heappop(tas)
+        if v1 in deja_vu:
+            continue
+        deja_vu.add(v1)
+        étapes.append(v1)
+        if v1 in cibles:
+            chemin = reconstruire_chemin(parents, v1)
+            return chemin, étapes, (chemin[0], v1)
+        for v2 in laby.voisins(v1):
+            if v2 in deja_vu:
+                continue
+            precedent = minis.get(v2, None)
+            suivant = cout + 1  # On suppose que toutes les arêtes ont un poids de 1
+            if precedent is None or suivant < precedent:
+                minis[v2] = suivant
+                parents[v2] = v1
+                heapq.heappush(tas, (suivant + estimer(v2, laby), suivant, v2))
+    return None, étapes, None
+
+
+def dijkstra_multi_etapes(laby, sources, cibles):
+    """
+    Implémente Dijkstra depuis plusieurs sources vers plusieurs cibles (voir astar_multi_etapes).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le chemin (ou None), la liste des étapes explorées et le couple (source, cible) (ou None).
+    """
+    return astar_multi_etapes(laby, sources, cibles, None)
+
+
+def astar_multi(laby, sources, cibles, estimation=heuristique):
+    """
+    Renvoie le plus court chemin d'une des sources à une des cibles et le couple (source, cible)
+    correspondant, ou (None, None) (voir astar_multi_etapes).
+    """
+    chemin, _, paire = astar_multi_etapes(laby, sources, cibles, estimation)
+    return chemin, paire
+
+
+def dijkstra_multi(laby, sources, cibles):
+    """
+    Renvoie le plus court chemin d'une des sources à une des cibles et le couple (source, cible)
+    correspondant, ou (None, None) (voir astar_multi_etapes).
+    """
+    chemin, _, paire = astar_multi_etapes(laby, sources, cibles, None)
+    return chemin, paire
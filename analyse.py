@@ -0,0 +1,243 @@
+import sys
+import numpy as np
+from class_graphe import GrapheGrille, HAUT, BAS, GAUCHE, DROITE, NB_PASSAGES, passages
+from labyrinthe import generer_grille, generer_tresse
+
+
+TABLE_DEGRES = np.array(NB_PASSAGES, dtype=np.uint8)
+METRIQUES = ["culs_de_sac", "carrefours", "couloir_moyen", "couloir_max",
+             "longueur_solution", "tortuosite", "branchement"]
+
+
+def murs_numpy(laby):
+    """
+    Renvoie les passages d'un labyrinthe sous forme de tableau NumPy.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe (GrapheGrille, ou tout graphe l x h possédant une méthode arc).
+    ------------------------------------------------------------------------------------------------
+    Pour un GrapheGrille, le tampon de murs est directement vu comme un tableau sans copie.
+    Pour les autres représentations, les bits sont reconstruits case par case (voir passages).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau uint8 de forme (h, l) contenant les bits de passage de chaque case.
+    """
+    if isinstance(laby, GrapheGrille):
+        return np.frombuffer(laby.murs, dtype=np.uint8).reshape(laby.h, laby.l)
+    return np.frombuffer(passages(laby), dtype=np.uint8).reshape(laby.h, laby.l)
+
+
+def empiler(labys):
+    """
+    Empile les murs de plusieurs labyrinthes de même taille en un seul tableau.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - labys : Une liste de labyrinthes de mêmes dimensions.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau uint8 de forme (k, h, l).
+    """
+    return np.stack([murs_numpy(laby) for laby in labys])
+
+
+def degres(murs):
+    """
+    Calcule le degré de chaque case à partir des bits de passage.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de bits de passage, de forme quelconque.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau uint8 de même forme contenant le nombre de passages de chaque case.
+    """
+    return TABLE_DEGRES[murs & 15]
+
+
+def distances_bfs(murs, sources, arrets=None):
+    """
+    Calcule les distances de parcours en largeur dans un lot de labyrinthes, en parallèle.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de forme (k, h, l).
+    - sources : Indices (dans chaque labyrinthe) des cases de départ, un par labyrinthe.
+    - arrets : Indices optionnels des cases dont la distance suffit ; le parcours s'arrête
+      dès qu'elles sont toutes atteintes.
+    ------------------------------------------------------------------------------------------------
+    Chaque itération avance d'un pas la frontière de tous les labyrinthes à la fois,
+    par décalage des tableaux booléens de passages ouverts.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau int32 de forme (k, h, l) contenant les distances (-1 pour une case non atteinte).
+    """
+    k, h, l = murs.shape
+    haut, bas = (murs & HAUT) != 0, (murs & BAS) != 0
+    gauche, droite = (murs & GAUCHE) != 0, (murs & DROITE) != 0
+    dist = np.full((k, h, l), -1, dtype=np.int32)
+    plat = dist.reshape(k, h * l)
+    lignes = np.arange(k)
+    plat[lignes, sources] = 0
+    frontiere = dist == 0
+    d = 0
+    while frontiere.any():
+        if arrets is not None and (plat[lignes, arrets] >= 0).all():
+            break
+        d += 1
+        suivante = np.zeros_like(frontiere)
+        suivante[:, :-1, :] |= frontiere[:, 1:, :] & haut[:, 1:, :]
+        suivante[:, 1:, :] |= frontiere[:, :-1, :] & bas[:, :-1, :]
+        suivante[:, :, :-1] |= frontiere[:, :, 1:] & gauche[:, :, 1:]
+        suivante[:, :, 1:] |= frontiere[:, :, :-1] & droite[:, :, :-1]
+        suivante &= dist < 0
+        dist[suivante] = d
+        frontiere = suivante
+    return dist
+
+
+def longueurs_couloirs(murs):
+    """
+    Mesure les couloirs (chaînes maximales de cases de degré 2) d'un lot de labyrinthes.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de forme (k, h, l).
+    ------------------------------------------------------------------------------------------------
+    Chaque case de degré 2 reçoit comme étiquette le plus petit indice de son couloir, par
+    propagation du minimum le long des passages combinée à des sauts de pointeurs,
+    puis les étiquettes sont comptées.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau des numéros de labyrinthe de chaque couloir.
+    - Un tableau des longueurs (en cases) de chaque couloir.
+    """
+    k, h, l = murs.shape
+    plat = murs.reshape(-1)
+    deg2 = degres(plat) == 2
+    indices = np.arange(plat.size)
+    paires = []
+    for bit, decalage in ((HAUT, -l), (BAS, l), (GAUCHE, -1), (DROITE, 1)):
+        a = indices[deg2 & ((plat & bit) != 0)]
+        b = a + decalage
+        garde = deg2[b]
+        paires.append((a[garde], b[garde]))
+
+    etiquettes = indices.copy()
+    while True:
+        nouvelles = etiquettes.copy()
+        for a, b in paires:
+            nouvelles[a] = np.minimum(nouvelles[a], etiquettes[b])
+        nouvelles = nouvelles[nouvelles]
+        if np.array_equal(nouvelles, etiquettes):
+            break
+        etiquettes = nouvelles
+
+    couloirs, longueurs = np.unique(etiquettes[deg2], return_counts=True)
+    return couloirs // (h * l), longueurs
+
+
+def analyser(murs):
+    """
+    Calcule les statistiques de chaque labyrinthe d'un lot.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de forme (k, h, l), l'entrée étant la case 0 et la sortie la case l*h-1.
+    ------------------------------------------------------------------------------------------------
+    Les métriques sont : nombre de culs-de-sac (degré 1), de carrefours (degré >= 3),
+    longueur moyenne et maximale des couloirs, longueur de la solution (en pas),
+    tortuosité (longueur de la solution rapportée à la distance de Manhattan) et
+    branchement (nombre moyen d'embranchements latéraux par case de la solution).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un dictionnaire associant à chaque nom de METRIQUES un tableau de k valeurs.
+    ------------------------------------------------------------------------------------------------
+    Exceptions :
+    - ValueError si, dans un des labyrinthes, la sortie n'est pas accessible depuis l'entrée.
+    """
+    k, h, l = murs.shape
+    n = h * l
+    deg = degres(murs).reshape(k, n)
+    stats = {
+        "culs_de_sac": (deg == 1).sum(axis=1),
+        "carrefours": (deg >= 3).sum(axis=1),
+    }
+
+    numeros, longueurs = longueurs_couloirs(murs)
+    nb = np.bincount(numeros, minlength=k)
+    stats["couloir_moyen"] = np.bincount(numeros, weights=longueurs, minlength=k) / np.maximum(nb, 1)
+    stats["couloir_max"] = np.zeros(k, dtype=np.int64)
+    np.maximum.at(stats["couloir_max"], numeros, longueurs)
+
+    sorties = np.full(k, n - 1)
+    dist = distances_bfs(murs, np.zeros(k, dtype=np.int64), sorties).reshape(k, n)
+    lignes = np.arange(k)
+    longueur = dist[lignes, sorties]
+    fermes = np.flatnonzero(longueur < 0)
+    if fermes.size:
+        raise ValueError(f"Sortie inaccessible depuis l'entrée dans {fermes.size} labyrinthe(s) "
+                         f"du lot (indices {fermes[:10].tolist()})")
+    stats["longueur_solution"] = longueur
+    stats["tortuosite"] = longueur / max(l + h - 2, 1)
+
+    # Remontée simultanée des chemins depuis la sortie, en cumulant les degrés rencontrés
+    plat = murs.reshape(k, n)
+    pos = sorties.copy()
+    somme = deg[lignes, pos].astype(np.int64)
+    for d in range(int(longueur.max()), 0, -1):
+        actifs = longueur >= d
+        choix = pos.copy()
+        trouve = np.zeros(k, dtype=bool)
+        for bit, decalage in ((HAUT, -l), (BAS, l), (GAUCHE, -1), (DROITE, 1)):
+            voisin = np.clip(pos + decalage, 0, n - 1)
+            ok = ~trouve & ((plat[lignes, pos] & bit) != 0) & (dist[lignes, voisin] == d - 1)
+            choix = np.where(ok, voisin, choix)
+            trouve |= ok
+        pos = np.where(actifs, choix, pos)
+        somme += np.where(actifs, deg[lignes, pos], 0)
+    cases = longueur + 1
+    stats["branchement"] = (somme - 2 * longueur) / cases
+    return stats
+
+
+def comparer_generateurs(generateurs, l, h, nb=100):
+    """
+    Génère des lots de labyrinthes avec plusieurs générateurs et compare leurs statistiques.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - generateurs : Dictionnaire associant un nom à une fonction (l, h) -> labyrinthe.
+    - l, h : Dimensions des labyrinthes.
+    - nb : Nombre de labyrinthes par générateur.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un dictionnaire associant à chaque nom de générateur le résultat de analyser.
+    """
+    return {nom: analyser(empiler([f(l, h) for _ in range(nb)]))
+            for nom, f in generateurs.items()}
+
+
+def tableau_resume(resultats):
+    """
+    Met en forme un tableau comparatif (moyenne ± écart-type) des statistiques par générateur.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - resultats : Dictionnaire renvoyé par comparer_generateurs.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères contenant le tableau, une ligne par métrique.
+    """
+    noms = list(resultats)
+    lignes = ["{:<18}".format("métrique") + "".join("{:>24}".format(nom) for nom in noms)]
+    for m in METRIQUES:
+        cellules = ["{:>24}".format("{:.2f} ± {:.2f}".format(resultats[nom][m].mean(), resultats[nom][m].std()))
+                    for nom in noms]
+        lignes.append("{:<18}".format(m) + "".join(cellules))
+    return "\n".join(lignes)
+
+
+GENERATEURS = {
+    "backtracking": generer_grille,
+    "tressé 50 %": generer_tresse,
+    "tressé + salles": lambda l, h: generer_tresse(l, h, 0.5, (l * h) // 200),
+}
+
+
+if __name__ == "__main__":
+    l, h, nb = (int(x) for x in (sys.argv[1:4] if len(sys.argv) >= 4 else (50, 50, 100)))
+    print(tableau_resume(comparer_generateurs(GENERATEURS, l, h, nb)))
@@ -1,3 +1,26 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+# Bits de passage utilisés par GrapheGrille (un bit par direction ouverte)
+HAUT = 1
+BAS = 2
+GAUCHE = 4
+DROITE = 8
+OPPOSE = {HAUT: BAS, BAS: HAUT, GAUCHE: DROITE, DROITE: GAUCHE}
+NB_PASSAGES = [bin(b).count("1") for b in range(16)]
+# En-tête des fichiers de grille : magique, l, h (suivi de l*h octets de passages)
+ENTETE_GRILLE = struct.Struct("<4sII")
+# Tailles (en octets) des objets Python utilisées par les estimations de mémoire
+TAILLE_LISTE = sys.getsizeof([])
+TAILLE_POINTEUR = struct.calcsize("P")
+TAILLE_BYTEARRAY = sys.getsizeof(bytearray(1)) - 1
+TAILLE_ARRAY = sys.getsizeof(array("i"))
+
+
 
 class GrapheM:
     """
@@ -57,6 +80,16 @@ class GrapheM:
         self.adj[s1][s2]=False
         self.adj[s2][s1]=False
 
+    def memoire(self):
+        """Retourne la mémoire (en octets) occupée par la matrice d'adjacence."""
+        return sys.getsizeof(self.adj) + sum(sys.getsizeof(ligne) for ligne in self.adj)
+
+    @staticmethod
+    def memoire_estimee(l, h):
+        """Retourne la mémoire (en octets) qu'occuperait la matrice d'un graphe l x h, sans la créer."""
+        n = l*h
+        return (n + 1) * (TAILLE_LISTE + TAILLE_POINTEUR * n)
+
 
 class GrapheD:
     """
@@ -117,6 +150,10 @@ class GrapheD:
         """Supprime l'arc entre les sommets s1 et s2."""
         self.adj[s1].remove(s2)
 
+    def memoire(self):
+        """Retourne la mémoire (en octets) occupée par le dictionnaire d'adjacence et ses ensembles."""
+        return sys.getsizeof(self.adj) + sum(sys.getsizeof(v) for v in self.adj.values())
+
 
 class GraphePondM:
     """"
@@ -178,6 +215,11 @@ class GraphePondM:
         self.adj[s1][s2]=float('inf')
         self.adj[s2][s1]=float('inf')
 
+    def memoire(self):
+        """Retourne la mémoire (en octets) occupée par la matrice, poids flottants compris."""
+        return (sys.getsizeof(self.adj) + sum(sys.getsizeof(ligne) for ligne in self.adj)
+                + sum(sys.getsizeof(p) for ligne in self.adj for p in ligne if isinstance(p, float)))
+
 
 class GraphePondD:
     """"
@@ -247,4 +289,248 @@ class GraphePondD:
             if self.adj[s1][i][0]==s2:
                 print("dest",self.adj[s1][i][0])
                 del(self.adj[s1][i])
-                break        
+                break
+
+    def memoire(self):
+        """Retourne la mémoire (en octets) occupée par le dictionnaire d'adjacence et ses listes d'arcs."""
+        return sys.getsizeof(self.adj) + sum(sys.getsizeof(arcs) + sum(sys.getsizeof(a) for a in arcs)
+                                             for arcs in self.adj.values())
+
+
+class GrapheGrille:
+    """
+    Représente un labyrinthe l x h à l'aide d'un masque de bits par case.
+    Chaque case stocke dans un octet ses passages ouverts (HAUT, BAS, GAUCHE, DROITE),
+    ce qui permet de manipuler des grilles de plusieurs millions de cases.
+    Les sommets sont numérotés de 0 à n-1, ligne par ligne.
+    """
+
+    def __init__(self, l, h, murs=None):
+        """
+        Initialise une grille de dimensions l x h dont toutes les cases sont fermées.
+        Un tampon existant de l*h octets (bytearray, mmap...) peut être fourni via murs.
+        """
+        self.n = l*h
+        self.l = l
+        self.h = h
+        self.murs = bytearray(self.n) if murs is None else murs
+
+    def direction(self, s1, s2):
+        """Retourne le bit du passage allant de s1 vers s2, ou 0 si les cases ne sont pas adjacentes."""
+        d = s2 - s1
+        if d == self.l:
+            return BAS
+        if d == -self.l:
+            return HAUT
+        if d == 1 and s2 % self.l != 0:
+            return DROITE
+        if d == -1 and s1 % self.l != 0:
+            return GAUCHE
+        return 0
+
+    def ajouter_arc(self,s1,s2):
+        """Ouvre le passage entre les cases adjacentes s1 et s2."""
+        b = self.direction(s1, s2)
+        assert b, 'Cases non adjacentes'
+        self.murs[s1] |= b
+        self.murs[s2] |= OPPOSE[b]
+
+    def arc(self,s1,s2):
+        """Retourne True si un passage existe entre s1 et s2, sinon False."""
+        b = self.direction(s1, s2)
+        return b != 0 and self.murs[s1] & b != 0
+
+    def voisins(self, s):
+        """Retourne une liste des sommets voisins de s."""
+        m = self.murs[s]
+        v = []
+        if m & HAUT:
+            v.append(s - self.l)
+        if m & BAS:
+            v.append(s + self.l)
+        if m & GAUCHE:
+            v.append(s - 1)
+        if m & DROITE:
+            v.append(s + 1)
+        return v
+
+    def afficher(self):
+        """Affiche la liste d'adjacence du graphe."""
+        for s in range(self.n):
+            print(s,"->", end="")
+            for v in self.voisins(s):
+                print("",v,end="")
+            print()
+
+    def degre(self, s):
+        """Retourne le degré (nombre d'arcs) du sommet s."""
+        return NB_PASSAGES[self.murs[s] & 15]
+
+    def nb_arcs(self):
+        """Retourne le nombre total d'arcs dans le graphe."""
+        n=0
+        for s in range(self.n):
+            n+=self.degre(s)
+        return n
+
+    def supprimer_arc(self,s1,s2):
+        """Referme le passage entre les cases adjacentes s1 et s2."""
+        b = self.direction(s1, s2)
+        assert b, 'Cases non adjacentes'
+        self.murs[s1] &= ~b
+        self.murs[s2] &= ~OPPOSE[b]
+
+    def vers_matrice(self):
+        """Retourne une copie du labyrinthe sous forme de GrapheM."""
+        g = GrapheM(self.l, self.h)
+        for s in range(self.n):
+            if self.murs[s] & DROITE:
+                g.ajouter_arc(s, s + 1)
+            if self.murs[s] & BAS:
+                g.ajouter_arc(s, s + self.l)
+        return g
+
+    def vers_csr(self):
+        """Retourne une copie du labyrinthe sous forme de GrapheCSR."""
+        debuts = array("i", bytes(4 * (self.n + 1)))
+        cibles = array("i")
+        for s in range(self.n):
+            cibles.extend(self.voisins(s))
+            debuts[s + 1] = len(cibles)
+        return GrapheCSR(self.l, self.h, debuts, cibles)
+
+    def memoire(self):
+        """
+        Retourne la mémoire (en octets) occupée par les murs dans le tas du processus.
+        Pour une grille projetée en mémoire, seul l'objet d'accès est compté : les octets
+        eux-mêmes sont dans le cache de fichiers du système.
+        """
+        return sys.getsizeof(self.murs)
+
+    @staticmethod
+    def memoire_estimee(l, h):
+        """Retourne la mémoire (en octets) qu'occuperait une grille l x h, sans la créer."""
+        return TAILLE_BYTEARRAY + l*h
+
+
+class GrapheCSR:
+    """
+    Représente un labyrinthe l x h en lignes creuses compressées (CSR), en lecture seule.
+    Les voisins de s sont cibles[debuts[s]:debuts[s+1]] : les lister ne coûte qu'une tranche
+    de tableau, sans test de bits ni parcours de ligne.
+    """
+
+    def __init__(self, l, h, debuts, cibles):
+        """
+        Initialise le graphe à partir de ses deux tableaux d'entiers :
+        debuts (n+1 valeurs croissantes) et cibles (les voisins, case par case).
+        """
+        self.n = l*h
+        self.l = l
+        self.h = h
+        self.debuts = debuts
+        self.cibles = cibles
+
+    def arc(self,s1,s2):
+        """Retourne True si un passage existe entre s1 et s2, sinon False."""
+        return s2 in self.cibles[self.debuts[s1]:self.debuts[s1 + 1]]
+
+    def voisins(self, s):
+        """Retourne une liste des sommets voisins de s."""
+        return self.cibles[self.debuts[s]:self.debuts[s + 1]].tolist()
+
+    def afficher(self):
+        """Affiche la liste d'adjacence du graphe."""
+        for s in range(self.n):
+            print(s,"->", end="")
+            for v in self.voisins(s):
+                print("",v,end="")
+            print()
+
+    def degre(self, s):
+        """Retourne le degré (nombre d'arcs) du sommet s."""
+        return self.debuts[s + 1] - self.debuts[s]
+
+    def nb_arcs(self):
+        """Retourne le nombre total d'arcs dans le graphe."""
+        return len(self.cibles)
+
+    def memoire(self):
+        """Retourne la mémoire (en octets) occupée par les deux tableaux."""
+        return sys.getsizeof(self.debuts) + sys.getsizeof(self.cibles)
+
+    @staticmethod
+    def memoire_estimee(l, h, nb_arcs=None):
+        """
+        Retourne la mémoire (en octets) qu'occuperait un graphe CSR l x h, sans le créer.
+        Sans nombre d'arcs (orientés) connu, on prend celui d'une grille entièrement ouverte.
+        """
+        if nb_arcs is None:
+            nb_arcs = 2 * (2*l*h - l - h)
+        return 2 * TAILLE_ARRAY + 4 * (l*h + 1) + 4 * nb_arcs
+
+
+def passages(laby):
+    """
+    Retourne les passages d'un labyrinthe l x h sous forme d'un octet de bits par case.
+    Fonctionne avec toute représentation possédant l, h et arc ; pour un GrapheGrille, c'est une copie de murs.
+    """
+    if isinstance(laby, GrapheGrille):
+        return bytearray(laby.murs)
+    l, n = laby.l, laby.l * laby.h
+    murs = bytearray(n)
+    for s in range(n):
+        if s % l != l - 1 and laby.arc(s, s + 1):
+            murs[s] |= DROITE
+            murs[s + 1] |= GAUCHE
+        if s + l < n and laby.arc(s, s + l):
+            murs[s] |= BAS
+            murs[s + l] |= HAUT
+    return murs
+
+
+def sauver_grille(g, fichier):
+    """
+    Écrit un GrapheGrille dans un fichier (en-tête puis un octet de passages par case).
+    Le fichier est écrit à côté puis mis en place par os.replace : les processus qui projettent
+    encore l'ancien fichier en mémoire (voir charger_grille) gardent son contenu intact.
+    """
+    dossier = os.path.dirname(os.path.abspath(fichier))
+    with tempfile.NamedTemporaryFile("wb", dir=dossier, suffix=".tmp", delete=False) as f:
+        try:
+            f.write(ENTETE_GRILLE.pack(b"LGRL", g.l, g.h))
+            f.write(g.murs)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, fichier)
+
+
+def grille_projetee(l, h, fichier=None):
+    """
+    Crée un GrapheGrille l x h fermé dont les murs sont dans un fichier projeté en mémoire (lecture et écriture).
+    Sans nom de fichier, un fichier temporaire anonyme est utilisé : la grille peut dépasser
+    la mémoire disponible, le système ne gardant en RAM que les pages récemment utilisées.
+    """
+    f = open(fichier, "w+b") if fichier else tempfile.TemporaryFile()
+    with f:
+        f.truncate(max(l*h, 1))
+        projete = mmap.mmap(f.fileno(), 0)
+    return GrapheGrille(l, h, memoryview(projete)[:l*h])
+
+
+def charger_grille(fichier, projection=True):
+    """
+    Lit un GrapheGrille écrit par sauver_grille.
+    Avec projection=True, le fichier est projeté en mémoire (mmap, lecture seule) au lieu d'être chargé :
+    seules les pages effectivement parcourues sont lues, ce qui permet de traiter des grilles plus grandes que la RAM.
+    """
+    with open(fichier, "rb") as f:
+        magique, l, h = ENTETE_GRILLE.unpack(f.read(ENTETE_GRILLE.size))
+        if magique != b"LGRL":
+            raise ValueError(f"{fichier} n'est pas un fichier de grille")
+        if not projection:
+            return GrapheGrille(l, h, bytearray(f.read(l * h)))
+        projete = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return GrapheGrille(l, h, memoryview(projete)[ENTETE_GRILLE.size:ENTETE_GRILLE.size + l * h])
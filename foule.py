@@ -0,0 +1,241 @@
+import argparse
+import time
+import numpy as np
+import pygame
+from class_graphe import GrapheGrille, HAUT, BAS, GAUCHE, DROITE
+from analyse import murs_numpy
+from reperes import parcours_largeur
+
+
+COULEUR_MUR = (255, 255, 255)
+COULEUR_AGENT = (255, 140, 0)
+COULEUR_SORTIE = (255, 0, 0)
+
+
+def champ_de_flux(murs, sortie):
+    """
+    Calcule, pour chaque case, la case voisine par laquelle se rapprocher de la sortie.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de forme (h, l) des bits de passage.
+    - sortie : La case de sortie.
+    ------------------------------------------------------------------------------------------------
+    Les distances à la sortie sont obtenues par un seul parcours en largeur ; le choix du
+    voisin est ensuite fait pour toutes les cases à la fois, direction par direction.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau int32 de taille l*h : la case suivante (la case elle-même pour la sortie et
+      pour les cases qui ne peuvent pas l'atteindre).
+    """
+    h, l = murs.shape
+    plat = murs.reshape(-1)
+    grille = GrapheGrille(l, h, bytearray(plat.tobytes()))
+    dist = np.frombuffer(parcours_largeur(grille, sortie), dtype=np.intc)
+    suivant = np.arange(l * h, dtype=np.int32)
+    for bit, decalage in ((HAUT, -l), (BAS, l), (GAUCHE, -1), (DROITE, 1)):
+        cases = np.flatnonzero(((plat & bit) != 0) & (dist > 0))
+        mieux = cases[dist[cases + decalage] == dist[cases] - 1]
+        suivant[mieux] = mieux + decalage
+    return suivant
+
+
+def image_murs(murs):
+    """
+    Dessine les murs d'un labyrinthe dans une image de (2l+1) x (2h+1) pixels.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de forme (h, l) des bits de passage.
+    ------------------------------------------------------------------------------------------------
+    La case (i, j) occupe le pixel (2j+1, 2i+1) ; les pixels intermédiaires sont des murs
+    sauf si le passage correspondant est ouvert.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau booléen de forme (2l+1, 2h+1), indexé [x, y] comme pygame.surfarray, vrai sur les murs.
+    """
+    h, l = murs.shape
+    image = np.ones((2 * l + 1, 2 * h + 1), dtype=bool)
+    image[1::2, 1::2] = False
+    image[2:-1:2, 1::2] = ((murs[:, :-1] & DROITE) == 0).T
+    image[1::2, 2:-1:2] = ((murs[:-1, :] & BAS) == 0).T
+    return image
+
+
+class Foule:
+    """
+    Foule d'agents se dirigeant vers la sortie en suivant un champ de flux commun.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - l, h : Dimensions du labyrinthe.
+    - sortie : La case de sortie ; un agent qui l'atteint quitte le labyrinthe.
+    - suivant : Champ de flux (voir champ_de_flux).
+    - positions : Tableau int32 des cases des agents encore présents.
+    - occupe : Tableau booléen de taille l*h des cases occupées.
+    - nb_sortis : Nombre d'agents sortis.
+    - pas_effectues : Nombre de pas simulés.
+    ------------------------------------------------------------------------------------------------
+    Une case ne contient qu'un agent. À chaque pas, tous les agents visent d'un coup la case
+    donnée par le champ de flux (une seule lecture indexée) ; ceux dont la case visée était
+    libre au début du pas se déplacent, un seul (tiré au hasard) par case visée.
+    """
+
+    def __init__(self, murs, nb_agents, sortie=None, graine=None):
+        """
+        Place nb_agents agents sur des cases distinctes tirées au hasard parmi celles qui peuvent
+        atteindre la sortie, pour que la simulation se termine toujours.
+        ------------------------------------------------------------------------------------------------
+        Paramètres :
+        - murs : Tableau uint8 de forme (h, l) des bits de passage.
+        - nb_agents : Nombre d'agents (au plus le nombre de cases reliées à la sortie).
+        - sortie : La case de sortie (par défaut la dernière case).
+        - graine : Graine optionnelle du générateur aléatoire.
+        """
+        self.h, self.l = murs.shape
+        n = self.l * self.h
+        self.sortie = n - 1 if sortie is None else sortie
+        self.suivant = champ_de_flux(murs, self.sortie)
+        self.alea = np.random.default_rng(graine)
+        # ni sur la sortie, ni sur une case séparée d'elle par des murs
+        accessibles = np.flatnonzero(self.suivant != np.arange(n, dtype=np.int32))
+        cases = self.alea.choice(accessibles.size, size=min(nb_agents, accessibles.size), replace=False)
+        self.positions = accessibles[cases].astype(np.int32)
+        self.occupe = np.zeros(n, dtype=bool)
+        self.occupe[self.positions] = True
+        self.nb_sortis = 0
+        self.pas_effectues = 0
+
+    def pas(self):
+        """
+        Avance la simulation d'un pas.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - Le nombre d'agents qui se sont déplacés.
+        """
+        self.pas_effectues += 1
+        cibles = self.suivant[self.positions]
+        candidats = np.flatnonzero((cibles != self.positions) & ~self.occupe[cibles])
+        # un seul agent par case visée, tiré au hasard parmi les prétendants
+        candidats = self.alea.permutation(candidats)
+        _, premiers = np.unique(cibles[candidats], return_index=True)
+        gagnants = candidats[premiers]
+        self.occupe[self.positions[gagnants]] = False
+        self.positions[gagnants] = cibles[gagnants]
+        self.occupe[cibles[gagnants]] = True
+        sortis = self.positions == self.sortie
+        if sortis[gagnants].any():
+            self.occupe[self.sortie] = False
+            self.nb_sortis += int(sortis.sum())
+            self.positions = self.positions[~sortis]
+        return gagnants.size
+
+
+class RenduFoule:
+    """
+    Dessine une foule et son labyrinthe sur une surface, en un seul blit par image.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - fond : Tableau (2l+1, 2h+1, 3) des couleurs des murs, calculé une fois.
+    - pixels : Tableau de travail de même forme, recopié du fond à chaque image.
+    - image : Surface Pygame d'un pixel par case ou mur.
+    - taille : Dimensions (largeur, hauteur) de l'affichage à l'écran.
+    - ecran : Surface agrandie, réutilisée d'une image à l'autre.
+    """
+
+    def __init__(self, murs, taille, sortie):
+        """Prépare le fond du labyrinthe et les surfaces de travail."""
+        h, l = murs.shape
+        self.fond = np.zeros((2 * l + 1, 2 * h + 1, 3), dtype=np.uint8)
+        self.fond[image_murs(murs)] = COULEUR_MUR
+        self.fond[2 * (sortie % l) + 1, 2 * (sortie // l) + 1] = COULEUR_SORTIE
+        self.pixels = self.fond.copy()
+        self.image = pygame.Surface((2 * l + 1, 2 * h + 1))
+        self.taille = taille
+        self.ecran = pygame.Surface(taille)
+
+    def dessiner(self, fenetre, foule, position=(0, 0)):
+        """Dessine les agents de la foule sur le fond et copie le tout sur fenetre."""
+        self.pixels[...] = self.fond
+        self.pixels[2 * (foule.positions % foule.l) + 1, 2 * (foule.positions // foule.l) + 1] = COULEUR_AGENT
+        pygame.surfarray.blit_array(self.image, self.pixels)
+        pygame.transform.scale(self.image, self.taille, self.ecran)
+        fenetre.blit(self.ecran, position)
+
+
+def mesurer(l, h, nb_agents, nb_pas, tressage=0.0, taille=700, graine=0):
+    """
+    Mesure le temps de simulation et de rendu (hors écran) d'une foule.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - l, h : Dimensions du labyrinthe.
+    - nb_agents : Nombre d'agents.
+    - nb_pas : Nombre de pas simulés.
+    - tressage : Proportion de culs-de-sac supprimés.
+    - taille : Côté de l'affichage simulé, en pixels.
+    - graine : Graine des générateurs aléatoires.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères résumant les durées par pas et la cadence atteignable.
+    """
+    import random
+    from labyrinthe import generer_grille, tresser
+    random.seed(graine)
+    g = generer_grille(l, h)
+    if tressage:
+        tresser(g, tressage)
+    murs = murs_numpy(g)
+    t0 = time.perf_counter()
+    foule = Foule(murs, nb_agents, graine=graine)
+    preparation = time.perf_counter() - t0
+    rendu = RenduFoule(murs, (taille, taille), foule.sortie)
+    cible = pygame.Surface((taille, taille))
+    simulation = dessin = 0.0
+    for _ in range(nb_pas):
+        t0 = time.perf_counter()
+        foule.pas()
+        t1 = time.perf_counter()
+        rendu.dessiner(cible, foule)
+        t2 = time.perf_counter()
+        simulation += t1 - t0
+        dessin += t2 - t1
+    par_pas = (simulation + dessin) / nb_pas
+    return (f"Labyrinthe {l}x{h}, {nb_agents} agents : champ de flux en {1000 * preparation:.0f} ms\n"
+            f"pas : {1000 * simulation / nb_pas:.2f} ms, rendu : {1000 * dessin / nb_pas:.2f} ms, "
+            f"soit {1 / par_pas:.0f} images/s ; {foule.nb_sortis} agents sortis en {nb_pas} pas")
+
+
+def animer(l, h, nb_agents, tressage=0.0, ips=60, taille=700):
+    """Affiche la simulation dans une fenêtre, à ips pas par seconde, jusqu'à sa fermeture."""
+    from labyrinthe import generer_grille, tresser
+    from ordonnanceur import Ordonnanceur
+    g = generer_grille(l, h)
+    if tressage:
+        tresser(g, tressage)
+    murs = murs_numpy(g)
+    pygame.init()
+    try:
+        fenetre = pygame.display.set_mode((taille, taille))
+        foule = Foule(murs, nb_agents)
+        rendu = RenduFoule(murs, (taille, taille), foule.sortie)
+        ordonnanceur = Ordonnanceur(ips)
+        while not any(e.type == pygame.QUIT for e in ordonnanceur.evenements(True)):
+            foule.pas()
+            rendu.dessiner(fenetre, foule)
+            pygame.display.set_caption(f"Foule : {foule.positions.size} agents, {foule.nb_sortis} sortis, "
+                                       f"{ordonnanceur.horloge.get_fps():.0f} images/s")
+            pygame.display.flip()
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Simulation de foule par champ de flux.")
+    parseur.add_argument("l", type=int, nargs="?", default=500)
+    parseur.add_argument("h", type=int, nargs="?", default=500)
+    parseur.add_argument("agents", type=int, nargs="?", default=10000)
+    parseur.add_argument("--tressage", type=float, default=0.0)
+    parseur.add_argument("--pas", type=int, default=300, help="nombre de pas mesurés (sans --afficher)")
+    parseur.add_argument("--afficher", action="store_true", help="ouvre une fenêtre au lieu de mesurer")
+    args = parseur.parse_args()
+    if args.afficher:
+        animer(args.l, args.h, args.agents, args.tressage)
+    else:
+        print(mesurer(args.l, args.h, args.agents, args.pas, args.tressage))
@@ -0,0 +1,215 @@
+import heapq
+import sys
+import time
+from collections import deque
+from random import randrange, seed
+from algorithmes import heuristique, astar_etapes
+
+
+class Hierarchie:
+    """
+    Abstraction hiérarchique d'un labyrinthe pour la recherche de chemin (HPA*).
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - laby : Le graphe représentant le labyrinthe (de préférence un GrapheGrille).
+    - taille : Côté des blocs (clusters) carrés qui partitionnent la grille.
+    - entrees : Dictionnaire associant à chaque bloc l'ensemble de ses cases d'entrée.
+    - abstrait : Graphe abstrait pondéré {case d'entrée: {case d'entrée: distance}}.
+    ------------------------------------------------------------------------------------------------
+    Les cases d'entrée d'un bloc sont celles qui ont un passage vers un autre bloc. Le graphe
+    abstrait relie les entrées de blocs voisins (distance 1) et les entrées d'un même bloc
+    (distance d'un parcours en largeur restreint au bloc). Comme chaque chemin se découpe en
+    tronçons internes aux blocs, les distances du graphe abstrait sont exactes.
+    """
+
+    def __init__(self, laby, taille=16):
+        """
+        Découpe le labyrinthe en blocs de taille x taille et précalcule le graphe abstrait.
+        ------------------------------------------------------------------------------------------------
+        Paramètres :
+        - laby : Le graphe représentant le labyrinthe.
+        - taille : Côté des blocs, en cases.
+        """
+        self.laby = laby
+        self.taille = taille
+        self.nb_x = (laby.l + taille - 1) // taille
+        self.nb_y = (laby.h + taille - 1) // taille
+        self.entrees = {}
+        self.abstrait = {}
+        for c in range(self.nb_x * self.nb_y):
+            self.construire_bloc(c)
+
+    def bloc(self, s):
+        """Retourne le numéro du bloc contenant la case s."""
+        return (s // self.laby.l) // self.taille * self.nb_x + (s % self.laby.l) // self.taille
+
+    def cases(self, c):
+        """Retourne la liste des cases du bloc c."""
+        l, t = self.laby.l, self.taille
+        i0, j0 = (c // self.nb_x) * t, (c % self.nb_x) * t
+        return [l * i + j for i in range(i0, min(i0 + t, self.laby.h))
+                for j in range(j0, min(j0 + t, l))]
+
+    def parcours_local(self, source, c):
+        """
+        Parcours en largeur depuis source sans sortir du bloc c.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - Un dictionnaire {case: case précédente} des cases atteintes (source -> None).
+        - Un dictionnaire {case: distance à source}.
+        """
+        parents = {source: None}
+        dist = {source: 0}
+        file = deque([source])
+        while file:
+            s = file.popleft()
+            for v in self.laby.voisins(s):
+                if v not in dist and self.bloc(v) == c:
+                    parents[v] = s
+                    dist[v] = dist[s] + 1
+                    file.append(v)
+        return parents, dist
+
+    def construire_bloc(self, c):
+        """
+        (Re)calcule les entrées du bloc c et leurs arcs dans le graphe abstrait.
+        ------------------------------------------------------------------------------------------------
+        Les anciens sommets du bloc sont d'abord retirés, avec leurs arcs vers les blocs voisins.
+        """
+        for e in self.entrees.get(c, ()):
+            for v in self.abstrait.pop(e):
+                if v in self.abstrait:
+                    self.abstrait[v].pop(e, None)
+
+        entrees = set()
+        for s in self.cases(c):
+            sorties = [v for v in self.laby.voisins(s) if self.bloc(v) != c]
+            if sorties:
+                entrees.add(s)
+                self.abstrait[s] = {}
+                for v in sorties:
+                    # l'arc est ajouté depuis le bloc construit en dernier
+                    if v in self.abstrait:
+                        self.abstrait[s][v] = 1
+                        self.abstrait[v][s] = 1
+        self.entrees[c] = entrees
+
+        for e in entrees:
+            _, dist = self.parcours_local(e, c)
+            for f in entrees:
+                if f != e and f in dist:
+                    self.abstrait[e][f] = dist[f]
+
+    def modifier_mur(self, s1, s2, ouvert):
+        """
+        Ouvre (ouvert=True) ou ferme le passage entre s1 et s2, et met à jour les blocs concernés.
+        ------------------------------------------------------------------------------------------------
+        Seuls le ou les deux blocs contenant s1 et s2 sont reconstruits.
+        """
+        if ouvert:
+            self.laby.ajouter_arc(s1, s2)
+        else:
+            self.laby.supprimer_arc(s1, s2)
+        c1, c2 = self.bloc(s1), self.bloc(s2)
+        self.construire_bloc(c1)
+        if c2 != c1:
+            self.construire_bloc(c2)
+
+    def chercher(self, depart, arrivee):
+        """
+        Trouve un plus court chemin entre depart et arrivee via le graphe abstrait.
+        ------------------------------------------------------------------------------------------------
+        Prend en entrée :
+        - depart : Le sommet de départ.
+        - arrivee : Le sommet d'arrivée.
+        ------------------------------------------------------------------------------------------------
+        Le départ et l'arrivée sont reliés temporairement aux entrées de leur bloc (et entre eux
+        s'ils partagent un bloc), puis A* parcourt le graphe abstrait. Seuls les blocs traversés
+        par la route choisie sont ensuite raffinés en chemin case par case.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - Une liste de sommets allant de depart à arrivee, ou None si aucun chemin n'existe.
+        - Le nombre de sommets abstraits développés.
+        """
+        if depart == arrivee:
+            return [depart], 0
+        temporaires = {depart: {}, arrivee: {}}
+        c_dep, c_arr = self.bloc(depart), self.bloc(arrivee)
+        _, dist = self.parcours_local(depart, c_dep)
+        for e in self.entrees[c_dep]:
+            if e in dist:
+                temporaires[depart][e] = dist[e]
+        if arrivee in dist:
+            temporaires[depart][arrivee] = dist[arrivee]
+        _, dist = self.parcours_local(arrivee, c_arr)
+        for e in self.entrees[c_arr]:
+            if e in dist:
+                temporaires.setdefault(e, {})[arrivee] = dist[e]
+
+        tas = [(0, 0, depart)]
+        minis = {depart: 0}
+        precedent = {depart: None}
+        deja_vu = set()
+        while tas:
+            (_, cout, u) = heapq.heappop(tas)
+            if u in deja_vu:
+                continue
+            deja_vu.add(u)
+            if u == arrivee:
+                break
+            arcs = list(self.abstrait.get(u, {}).items()) + list(temporaires.get(u, {}).items())
+            for v, d in arcs:
+                suivant = cout + d
+                if v not in deja_vu and suivant < minis.get(v, suivant + 1):
+                    minis[v] = suivant
+                    precedent[v] = u
+                    heapq.heappush(tas, (suivant + heuristique(v, arrivee, self.laby), suivant, v))
+        if arrivee not in deja_vu:
+            return None, len(deja_vu)
+
+        route = [arrivee]
+        while precedent[route[-1]] is not None:
+            route.append(precedent[route[-1]])
+        route.reverse()
+        return self.raffiner(route), len(deja_vu)
+
+    def raffiner(self, route):
+        """
+        Transforme une route de sommets abstraits en chemin case par case.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - La liste des cases du chemin complet.
+        """
+        chemin = [route[0]]
+        for u, v in zip(route, route[1:]):
+            c = self.bloc(u)
+            if self.bloc(v) != c:
+                chemin.append(v)
+                continue
+            parents, _ = self.parcours_local(u, c)
+            troncon = [v]
+            while parents[troncon[-1]] is not None:
+                troncon.append(parents[troncon[-1]])
+            chemin.extend(reversed(troncon[:-1]))
+        return chemin
+
+    def nb_sommets(self):
+        """Retourne le nombre de sommets du graphe abstrait."""
+        return len(self.abstrait)
+
+
+if __name__ == "__main__":
+    from labyrinthe import generer_tresse
+    l, h = (int(x) for x in (sys.argv[1:3] if len(sys.argv) >= 3 else (400, 400)))
+    seed(0)
+    laby = generer_tresse(l, h, 0.3)
+    t0 = time.perf_counter()
+    hier = Hierarchie(laby)
+    print(f"Prétraitement : {time.perf_counter() - t0:.2f} s, {hier.nb_sommets()} sommets abstraits")
+    requetes = [(randrange(laby.n), randrange(laby.n)) for _ in range(20)]
+    for nom, resoudre in (("HPA*", lambda a, b: hier.chercher(a, b)[1]),
+                          ("A*", lambda a, b: len(astar_etapes(laby, a, b)[1]))):
+        t0 = time.perf_counter()
+        developpes = sum(resoudre(a, b) for a, b in requetes)
+        print(f"{nom:>5} : {1000 * (time.perf_counter() - t0) / len(requetes):.1f} ms / requête, "
+              f"{developpes / len(requetes):.0f} sommets développés")
@@ -0,0 +1,402 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+import numpy as np
+import pygame
+from class_graphe import GrapheGrille, HAUT, BAS, GAUCHE, DROITE
+from analyse import murs_numpy
+from foule import image_murs
+from memoire import representer
+
+
+# les images sont construites en indices de palette : un octet par pixel au lieu de trois
+FOND, MUR, CHEMIN = 0, 1, 2
+# murs noirs sur fond blanc ; le chemin est assez clair pour ne pas être relu comme un mur
+PALETTE = ((255, 255, 255), (0, 0, 0), (255, 160, 0))
+# luminance (0 à 255) en dessous de laquelle un pixel est un mur
+SEUIL_MUR = 128
+# compression zlib rapide : l'image d'un labyrinthe se compresse bien même au niveau 1
+NIVEAU_PNG = 1
+
+
+def indices_labyrinthe(laby, chemin=None, murs=None):
+    """
+    Construit l'image d'un labyrinthe, et éventuellement de son chemin, en une seule passe NumPy.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe (GrapheGrille, ou tout graphe l x h possédant une méthode arc).
+    - chemin : Liste optionnelle de sommets consécutifs à colorier.
+    - murs : Bits de passage (h, l) déjà calculés, pour éviter de les reconstruire.
+    ------------------------------------------------------------------------------------------------
+    Chaque case et chaque mur occupe un pixel (voir foule.image_murs) ; la sortie est ouverte
+    comme dans l'interface.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau uint8 (FOND, MUR ou CHEMIN) de forme (2l+1, 2h+1), indexé [x, y] comme
+      pygame.surfarray.
+    """
+    image = image_murs(murs_numpy(laby) if murs is None else murs)
+    image[-1, -2] = image[-2, -1] = False # sortie ouverte
+    indices = image.view(np.uint8) # MUR là où image est vrai, FOND ailleurs
+    if chemin:
+        cases = np.asarray(chemin, dtype=np.int64)
+        x = 2 * (cases % laby.l) + 1
+        y = 2 * (cases // laby.l) + 1
+        indices[x, y] = CHEMIN
+        # le passage entre deux cases consécutives est au milieu de leurs pixels
+        indices[(x[:-1] + x[1:]) // 2, (y[:-1] + y[1:]) // 2] = CHEMIN
+    return indices
+
+
+def surface_labyrinthe(indices, palette=PALETTE):
+    """Renvoie une surface Pygame 8 bits (hors écran) affichant les indices avec palette."""
+    surface = pygame.Surface(indices.shape, 0, 8)
+    surface.set_palette(list(palette) + [(0, 0, 0)] * (256 - len(palette)))
+    pygame.surfarray.blit_array(surface, indices)
+    return surface
+
+
+def agrandir(indices, pas):
+    """Agrandit une image d'un facteur entier pas (chaque pixel devient un carré pas x pas)."""
+    if pas == 1:
+        return indices
+    return np.repeat(np.repeat(indices, pas, axis=0), pas, axis=1)
+
+
+def bloc_png(nature, contenu):
+    """Renvoie un bloc PNG (longueur, nature, contenu, somme de contrôle CRC)."""
+    return struct.pack(">I", len(contenu)) + nature + contenu + struct.pack(">I", zlib.crc32(nature + contenu))
+
+
+def ecrire_png(indices, palette, fichier, niveau=NIVEAU_PNG):
+    """
+    Écrit une image à palette d'au plus 4 couleurs dans un fichier PNG, 2 bits par pixel.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - indices : Tableau uint8 (largeur, hauteur) d'indices de palette.
+    - palette : Liste des couleurs RGB.
+    - fichier : Chemin du fichier.
+    - niveau : Niveau de compression zlib.
+    ------------------------------------------------------------------------------------------------
+    pygame.image.save compresse au niveau par défaut de la libpng, trop lent pour des images de
+    plusieurs dizaines de millions de pixels : les lignes sont ici empaquetées par NumPy
+    (4 pixels par octet) puis compressées en une fois.
+    """
+    largeur, hauteur = indices.shape
+    lignes = np.zeros((hauteur, -(-largeur // 4) * 4), dtype=np.uint8)
+    lignes[:, :largeur] = indices.T
+    quads = lignes.reshape(hauteur, -1, 4)
+    donnees = np.zeros((hauteur, quads.shape[1] + 1), dtype=np.uint8) # octet de filtre nul en tête
+    donnees[:, 1:] = (quads[..., 0] << 6) | (quads[..., 1] << 4) | (quads[..., 2] << 2) | quads[..., 3]
+
+    with open(fichier, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(bloc_png(b"IHDR", struct.pack(">IIBBBBB", largeur, hauteur, 2, 3, 0, 0, 0)))
+        f.write(bloc_png(b"PLTE", bytes(c for couleur in palette for c in couleur)))
+        f.write(bloc_png(b"IDAT", zlib.compress(donnees, niveau)))
+        f.write(bloc_png(b"IEND", b""))
+
+
+def exporter_image(laby, fichier, chemin=None, pas=1, palette=PALETTE):
+    """
+    Enregistre un labyrinthe (et éventuellement son chemin) dans un fichier image, sans fenêtre.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe.
+    - fichier : Chemin du fichier ; le format suit l'extension (.png, .bmp, .tga, .jpg).
+    - chemin : Liste optionnelle de sommets à dessiner.
+    - pas : Côté en pixels d'une case ou d'un mur.
+    - palette : Couleurs de FOND, MUR et CHEMIN.
+    ------------------------------------------------------------------------------------------------
+    Avec la palette par défaut, les murs sont noirs sur fond blanc et l'image peut être relue
+    par importer_image. Les PNG sont écrits par ecrire_png, les autres formats par pygame.image.
+    """
+    indices = agrandir(indices_labyrinthe(laby, chemin), pas)
+    if fichier.lower().endswith(".png"):
+        ecrire_png(indices, palette, fichier)
+    else:
+        pygame.image.save(surface_labyrinthe(indices, palette), fichier)
+
+
+def epaisseur_mur(diagonale):
+    """
+    Mesure l'épaisseur des murs à partir du coin supérieur gauche de l'image.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - diagonale : Tableau booléen des pixels sombres de la diagonale partant du coin.
+    ------------------------------------------------------------------------------------------------
+    Le coin est un pilier (croisement de deux murs extérieurs) suivi de la première case,
+    claire : l'épaisseur est la longueur de la suite de pixels sombres sur la diagonale.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - L'épaisseur des murs, en pixels.
+    ------------------------------------------------------------------------------------------------
+    Exceptions :
+    - ValueError si le coin n'est pas un mur ou si la diagonale ne contient aucune case claire.
+    """
+    claires = np.flatnonzero(~diagonale)
+    if not diagonale[0] or claires.size == 0:
+        raise ValueError("Image non reconnue : le coin supérieur gauche doit être un mur suivi d'une case")
+    return int(claires[0])
+
+
+def diviseurs(n):
+    """Renvoie la liste croissante des diviseurs de l'entier n > 0."""
+    petits = [d for d in range(1, int(n ** 0.5) + 1) if n % d == 0]
+    return sorted(set(petits + [n // d for d in petits]))
+
+
+def positions_grille(taille, mur, periode):
+    """
+    Renvoie les coordonnées échantillonnées le long d'un axe de l'image, dans l'ordre des blocs.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - taille : Largeur (ou hauteur) de l'image, égale à n * periode + mur pour n cases.
+    - mur : Épaisseur des murs, en pixels.
+    - periode : Épaisseur d'un mur plus côté d'une case, en pixels.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau de 2n+1 coordonnées : milieu des murs (indices pairs) et des cases (impairs).
+    """
+    n = (taille - mur) // periode
+    positions = np.empty(2 * n + 1, dtype=np.int64)
+    positions[0::2] = np.arange(n + 1) * periode + mur // 2
+    positions[1::2] = np.arange(n) * periode + mur + (periode - mur) // 2
+    return positions
+
+
+def grille_coherente(blocs):
+    """
+    Vérifie qu'une grille de blocs (voir murs_depuis_blocs) peut être celle d'un labyrinthe.
+    ------------------------------------------------------------------------------------------------
+    Toutes les cases sont claires, tous les piliers du bord sont sombres et un pilier intérieur
+    n'est clair que si aucun des murs qui y aboutissent n'est sombre (un labyrinthe tressé peut
+    avoir des piliers isolés, qu'un dessin ne trace pas forcément).
+    """
+    piliers = blocs[0::2, 0::2]
+    horizontaux = blocs[1::2, 0::2] # murs entre deux piliers voisins en x
+    verticaux = blocs[0::2, 1::2]
+    murs_voisins = np.zeros_like(piliers)
+    murs_voisins[:-1, :] |= horizontaux
+    murs_voisins[1:, :] |= horizontaux
+    murs_voisins[:, :-1] |= verticaux
+    murs_voisins[:, 1:] |= verticaux
+    bord = np.concatenate((piliers[0], piliers[-1], piliers[:, 0], piliers[:, -1]))
+    return bool(bord.all() and not blocs[1::2, 1::2].any() and not (murs_voisins & ~piliers).any())
+
+
+def grille_image(lire, largeur, hauteur):
+    """
+    Retrouve la grille de cases d'une image de labyrinthe et lit ses murs.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - lire : Fonction (xs, ys) renvoyant le tableau booléen des pixels sombres (xs[i], ys[j])
+      (voir lecteur_sombres).
+    - largeur, hauteur : Dimensions de l'image.
+    ------------------------------------------------------------------------------------------------
+    L'épaisseur m des murs est lue dans le coin (voir epaisseur_mur). Pour n cases de côté c,
+    la largeur vaut n * (c + m) + m : la période c + m divise donc largeur - m et hauteur - m.
+    Les périodes possibles sont essayées de la plus petite à la plus grande ; la bonne est la
+    première dont la grille est cohérente (voir grille_coherente). Seul le milieu de chaque
+    case, mur et pilier est lu.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le tableau booléen (2l+1, 2h+1) des blocs sombres (voir murs_depuis_blocs).
+    ------------------------------------------------------------------------------------------------
+    Exceptions :
+    - ValueError si aucune grille cohérente n'est trouvée.
+    """
+    cote = min(largeur, hauteur)
+    k = min(cote, 64)
+    while True: # diagonale du coin, allongée tant qu'elle reste sombre
+        diagonale = lire(np.arange(k), np.arange(k)).diagonal()
+        if k == cote or not diagonale.all():
+            break
+        k = min(cote, 2 * k)
+    mur = epaisseur_mur(diagonale)
+    for periode in diviseurs(int(np.gcd(largeur - mur, hauteur - mur))):
+        if periode <= mur:
+            continue
+        xs = positions_grille(largeur, mur, periode)
+        ys = positions_grille(hauteur, mur, periode)
+        # rejet rapide sur la première rangée de cases avant de lire toute la grille
+        if lire(xs[1::2], ys[1:2]).any():
+            continue
+        blocs = lire(xs, ys)
+        if grille_coherente(blocs):
+            return blocs
+    raise ValueError(f"Image {largeur}x{hauteur} non reconnue : aucune grille de cases cohérente "
+                     f"avec des murs de {mur} pixels")
+
+
+def extraire(plan, xs, ys):
+    """
+    Extrait les pixels (xs[i], ys[j]) d'un plan de pixels indexé [x, y].
+    ------------------------------------------------------------------------------------------------
+    Les surfaces Pygame sont rangées ligne par ligne : la lecture se fait dans l'ordre [y, x]
+    de la mémoire, par simple découpage quand les positions sont régulièrement espacées.
+    """
+    yx = plan.T
+    sx, sy = regulieres(xs), regulieres(ys)
+    if sx is not None and sy is not None:
+        return yx[sy, sx].T
+    return yx[np.ix_(ys, xs)].T
+
+
+def regulieres(positions):
+    """Renvoie une tranche équivalente aux positions si elles sont régulièrement espacées, sinon None."""
+    if len(positions) == 1:
+        return slice(positions[0], positions[0] + 1)
+    pas = positions[1] - positions[0]
+    if pas > 0 and np.all(np.diff(positions) == pas):
+        return slice(positions[0], positions[-1] + 1, pas)
+    return None
+
+
+def lecteur_sombres(surface, seuil=SEUIL_MUR):
+    """
+    Renvoie une fonction (xs, ys) lisant les pixels sombres d'une surface, sans copier l'image.
+    ------------------------------------------------------------------------------------------------
+    Pour une image à palette, la luminance est calculée une fois par couleur de la palette ;
+    sinon, canal par canal sur les seuls pixels lus (voir sombre).
+    """
+    if surface.get_bytesize() == 1:
+        table = sombre(np.array(surface.get_palette(), dtype=np.uint8)[:, :3], seuil)
+        indices = pygame.surfarray.pixels2d(surface)
+        return lambda xs, ys: table[extraire(indices, xs, ys)]
+    pixels = pygame.surfarray.pixels3d(surface)
+    return lambda xs, ys: sombre(np.stack([extraire(pixels[..., canal], xs, ys) for canal in range(3)], axis=-1),
+                                 seuil)
+
+
+def murs_depuis_blocs(blocs):
+    """
+    Lit les bits de passage d'un labyrinthe à partir de sa grille de blocs.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - blocs : Tableau booléen (2l+1, 2h+1), indexé [x, y], vrai sur les murs : les indices
+      impairs sont les cases, les autres les murs et leurs croisements (comme foule.image_murs).
+    ------------------------------------------------------------------------------------------------
+    Le bord extérieur est ignoré (entrée et sortie peuvent y être ouvertes).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau uint8 de forme (h, l) contenant les bits de passage de chaque case.
+    """
+    l, h = blocs.shape[0] // 2, blocs.shape[1] // 2
+    droite = ~blocs[2:-1:2, 1::2].T # (h, l-1)
+    bas = ~blocs[1::2, 2:-1:2].T # (h-1, l)
+    murs = np.zeros((h, l), dtype=np.uint8)
+    murs[:, :-1] |= droite * np.uint8(DROITE)
+    murs[:, 1:] |= droite * np.uint8(GAUCHE)
+    murs[:-1, :] |= bas * np.uint8(BAS)
+    murs[1:, :] |= bas * np.uint8(HAUT)
+    return murs
+
+
+def importer_image(fichier, budget=None, seuil=SEUIL_MUR):
+    """
+    Charge un labyrinthe dessiné dans un fichier image (murs sombres sur une grille de cases).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - fichier : Chemin de l'image (tout format lu par pygame.image).
+    - budget : Budget mémoire en octets pour choisir la représentation (voir memoire).
+    - seuil : Luminance en dessous de laquelle un pixel est un mur.
+    ------------------------------------------------------------------------------------------------
+    Murs et cases peuvent avoir des épaisseurs différentes (voir grille_image). Seul le milieu
+    de chaque case et de chaque mur est lu, directement dans la surface (sans copie de l'image
+    entière) ; aucune fenêtre n'est ouverte.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le labyrinthe, dans la représentation choisie par memoire.representer.
+    ------------------------------------------------------------------------------------------------
+    Exceptions :
+    - ValueError si l'image ne représente pas un labyrinthe sur une grille de cases.
+    """
+    surface = pygame.image.load(fichier)
+    if surface.get_bytesize() == 2: # 16 bits : ni palette ni pixels3d
+        rgb = pygame.Surface(surface.get_size(), 0, 24)
+        rgb.blit(surface, (0, 0))
+        surface = rgb
+    blocs = grille_image(lecteur_sombres(surface, seuil), *surface.get_size())
+    g = GrapheGrille(blocs.shape[0] // 2, blocs.shape[1] // 2, bytearray(murs_depuis_blocs(blocs).tobytes()))
+    return representer(g, budget)
+
+
+def sombre(pixels, seuil=SEUIL_MUR):
+    """
+    Renvoie le masque des pixels RGB dont la luminance est inférieure à seuil.
+    ------------------------------------------------------------------------------------------------
+    La luminance est calculée en entiers sur 16 bits (coefficients 77, 150, 29 sur 256), pour ne
+    pas allouer de tableau flottant de la taille de l'image.
+    """
+    total = pixels[..., 0].astype(np.uint16)
+    total *= 77
+    for canal, poids in ((1, 150), (2, 29)):
+        composante = pixels[..., canal].astype(np.uint16)
+        composante *= poids
+        total += composante
+    return total < seuil * 256
+
+
+def mesurer(l, h, pas=1, fichier="labyrinthe_mesure.png"):
+    """
+    Mesure l'export puis l'import d'un labyrinthe l x h et vérifie que l'aller-retour est exact.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères résumant les durées.
+    """
+    from labyrinthe import generer_grille
+    t0 = time.perf_counter()
+    g = generer_grille(l, h)
+    t1 = time.perf_counter()
+    exporter_image(g, fichier, pas=pas)
+    t2 = time.perf_counter()
+    relu = importer_image(fichier)
+    t3 = time.perf_counter()
+    taille = os.path.getsize(fichier)
+    os.remove(fichier)
+    identique = np.array_equal(murs_numpy(relu), murs_numpy(g))
+    return (f"Labyrinthe {l}x{h} (généré en {t1 - t0:.1f} s) : export {t2 - t1:.2f} s "
+            f"({taille / 2**20:.1f} Mo), import {t3 - t2:.2f} s, aller-retour "
+            f"{'exact' if identique else 'DIFFÉRENT'}")
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Import et export de labyrinthes en images.")
+    commandes = parseur.add_subparsers(dest="commande", required=True)
+    exp = commandes.add_parser("exporter", help="génère un labyrinthe et l'enregistre en image")
+    exp.add_argument("l", type=int)
+    exp.add_argument("h", type=int)
+    exp.add_argument("fichier")
+    exp.add_argument("--tressage", type=float, default=0)
+    exp.add_argument("--pas", type=int, default=1, help="côté en pixels d'une case")
+    exp.add_argument("--chemin", action="store_true", help="dessine la solution")
+    imp = commandes.add_parser("importer", help="lit une image et résout le labyrinthe")
+    imp.add_argument("fichier")
+    imp.add_argument("--pas", type=int, default=1, help="côté en pixels d'une case de l'image résolue")
+    imp.add_argument("--solution", default=None, help="image où enregistrer le labyrinthe résolu")
+    mes = commandes.add_parser("mesurer", help="chronomètre un aller-retour export / import")
+    mes.add_argument("l", type=int, nargs="?", default=4000)
+    mes.add_argument("h", type=int, nargs="?", default=4000)
+    args = parseur.parse_args()
+
+    if args.commande == "exporter":
+        from labyrinthe import generer_grille, tresser
+        from remplissage import remplissage_chemin
+        g = generer_grille(args.l, args.h)
+        if args.tressage:
+            tresser(g, args.tressage)
+        chemin = remplissage_chemin(g, 0, g.n - 1) if args.chemin else None
+        exporter_image(g, args.fichier, chemin, args.pas)
+    elif args.commande == "importer":
+        from remplissage import remplissage_chemin
+        g = importer_image(args.fichier)
+        chemin = remplissage_chemin(g, 0, g.l * g.h - 1)
+        print(f"Labyrinthe {g.l}x{g.h} ({type(g).__name__}) : "
+              + (f"chemin de {len(chemin)} cases" if chemin else "aucun chemin"))
+        if args.solution:
+            exporter_image(g, args.solution, chemin, args.pas)
+    else:
+        print(mesurer(args.l, args.h))
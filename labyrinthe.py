@@ -1,6 +1,9 @@
+from array import array
+import random as _random # pas de nom « random » exporté par from labyrinthe import *
 from random import randint, choice
 from class_graphe import *
 from pile import *
+from memoire import choisir_representation, grille_vide, convertir
 
 
 def liste_voisins(case, vus, g):
@@ -54,44 +57,168 @@ def ajoute(g, pos, direction):
     g.ajouter_arc(s1, s2)
     
 
-def generer_laby(l, h):
+def generer_grille(l, h, g=None):
     """
-    Génère un labyrinthe aléatoire représenté sous forme de graphe.
+    Génère un labyrinthe aléatoire parfait sous forme de GrapheGrille.
     ------------------------------------------------------------------------------------------------
     Prend en entrée :
     - l : Entier représentant la largeur du labyrinthe (nombre de colonnes).
     - h : Entier représentant la hauteur du labyrinthe (nombre de lignes).
+    - g : GrapheGrille fermé optionnel dans lequel creuser (par exemple une grille projetée en
+      mémoire, voir memoire.py) ; par défaut une nouvelle grille est créée.
     ------------------------------------------------------------------------------------------------
-    Utilise une approche par backtracking avec une pile pour générer un labyrinthe connexe.
-    Chaque case est représentée comme un sommet dans un graphe. Les arcs du graphe
-    correspondent aux passages entre cases (destruction des murs).
+    Même backtracking que generer_laby, mais sur des indices de cases entiers : les cases vues
+    sont marquées dans un bytearray et la pile est un tableau d'entiers alloué une seule fois.
+    Les voisins sont examinés dans le même ordre que liste_voisins et tirés avec la même
+    séquence aléatoire, si bien qu'une même graine produit exactement le même labyrinthe.
+    Un labyrinthe 2000x2000 tient ainsi en quelques dizaines de Mo.
     ------------------------------------------------------------------------------------------------
     Renvoie :
-    - Un objet GrapheM représentant le labyrinthe généré.
+    - Un objet GrapheGrille représentant le labyrinthe généré.
     """
-    g = GrapheM(l, h)
+    n = l * h
+    g = GrapheGrille(l, h) if g is None else g
+    murs = g.murs
+    vus = bytearray(n)
+    pile = array('i', bytes(4 * n))
+    cases = [0, 0, 0, 0]
+    bits = [0, 0, 0, 0]
+    oppose = OPPOSE
+    tirer = _random.randrange
+
     i, j = randint(0, h-1), randint(0, l-1)
-    #assert i < l and j < h
-    pos = (i, j)
+    pos = l * i + j
+    vus[pos] = 1
+    pile[0] = pos
+    taille = 1
 
-    p = Pile()
-    p.empile(pos)
-    
-    vus = {pos}
-    voisins = liste_voisins(pos, vus, g)
-
-    while not p.est_vide():
-        pos = p.sommet()
-        voisins = liste_voisins(pos, vus, g)
-        if len(voisins) == 0:
-            p.depile()
-        else:
-            if len(voisins) == 1:
-                p.depile()
-            
-            direction = choice(voisins)
-            vus.add(direction)
-            ajoute(g, pos, direction)
-            p.empile(direction)
+    while taille:
+        pos = pile[taille - 1]
+        k = 0
+        if pos >= l and not vus[pos - l]:
+            cases[k], bits[k] = pos - l, HAUT
+            k += 1
+        if pos < n - l and not vus[pos + l]:
+            cases[k], bits[k] = pos + l, BAS
+            k += 1
+        j = pos % l
+        if j > 0 and not vus[pos - 1]:
+            cases[k], bits[k] = pos - 1, GAUCHE
+            k += 1
+        if j < l - 1 and not vus[pos + 1]:
+            cases[k], bits[k] = pos + 1, DROITE
+            k += 1
+
+        if k == 0:
+            taille -= 1
+            continue
+        if k == 1:
+            taille -= 1
+
+        r = tirer(k) # même tirage que choice sur une liste de k voisins
+        suivant, b = cases[r], bits[r]
+        vus[suivant] = 1
+        murs[pos] |= b
+        murs[suivant] |= oppose[b]
+        pile[taille] = suivant
+        taille += 1
+    return g
+
+
+def tresser(g, proportion, nb_salles=0, taille_salle=4):
+    """
+    Transforme un labyrinthe parfait en labyrinthe à boucles (tressé).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - g : Objet du type GrapheGrille représentant le labyrinthe.
+    - proportion : Réel entre 0 et 1, proportion des culs-de-sac à supprimer.
+    - nb_salles : Nombre de salles ouvertes (rectangles sans murs intérieurs) à ajouter.
+    - taille_salle : Côté maximal des salles, en cases.
+    ------------------------------------------------------------------------------------------------
+    Parcourt les cases une seule fois : chaque case encore en cul-de-sac est ouverte avec la
+    probabilité donnée vers une case voisine, de préférence elle-même en cul-de-sac (ce qui en
+    supprime deux d'un coup). Les salles sont ensuite creusées à des positions aléatoires.
+    Le coût total est linéaire en nombre de cases.
+    ------------------------------------------------------------------------------------------------
+    Ne renvoie rien (modifie le graphe en place).
+    """
+    l, n, murs = g.l, g.n, g.murs
+    for s in range(n):
+        if NB_PASSAGES[murs[s]] != 1 or _random.random() >= proportion:
+            continue
+        fermes = []
+        if s >= l and not murs[s] & HAUT:
+            fermes.append(s - l)
+        if s < n - l and not murs[s] & BAS:
+            fermes.append(s + l)
+        if s % l > 0 and not murs[s] & GAUCHE:
+            fermes.append(s - 1)
+        if s % l < l - 1 and not murs[s] & DROITE:
+            fermes.append(s + 1)
+        if not fermes:
+            continue
+        culs = [v for v in fermes if NB_PASSAGES[murs[v]] == 1]
+        g.ajouter_arc(s, choice(culs or fermes))
+
+    for _ in range(nb_salles):
+        largeur = randint(2, min(taille_salle, l)) if l > 1 else 1
+        hauteur = randint(2, min(taille_salle, g.h)) if g.h > 1 else 1
+        i0, j0 = randint(0, g.h - hauteur), randint(0, l - largeur)
+        for i in range(i0, i0 + hauteur):
+            for j in range(j0, j0 + largeur):
+                s = l * i + j
+                if j < j0 + largeur - 1:
+                    g.ajouter_arc(s, s + 1)
+                if i < i0 + hauteur - 1:
+                    g.ajouter_arc(s, s + l)
+
+
+def generer_tresse(l, h, proportion=0.5, nb_salles=0):
+    """
+    Génère un labyrinthe à boucles, offrant plusieurs chemins entre l'entrée et la sortie.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - l, h : Dimensions du labyrinthe.
+    - proportion : Proportion des culs-de-sac à supprimer (voir tresser).
+    - nb_salles : Nombre de salles ouvertes à ajouter.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un objet GrapheGrille représentant le labyrinthe généré.
+    """
+    g = generer_grille(l, h)
+    tresser(g, proportion, nb_salles)
     return g
 
+
+def generer_laby(l, h, tressage=0, salles=0, budget=None, supplement=0):
+    """
+    Génère un labyrinthe aléatoire représenté sous forme de graphe.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - l : Entier représentant la largeur du labyrinthe (nombre de colonnes).
+    - h : Entier représentant la hauteur du labyrinthe (nombre de lignes).
+    - tressage : Proportion optionnelle de culs-de-sac à supprimer (0 : labyrinthe parfait).
+    - salles : Nombre optionnel de salles ouvertes à ajouter.
+    - budget : Mémoire vive disponible en octets (par défaut memoire.BUDGET_DEFAUT).
+    - supplement : Mémoire en octets que l'appelant allouera ensuite (par exemple
+      memoire.cout_interface pour l'interface graphique), réservée dans le budget.
+    ------------------------------------------------------------------------------------------------
+    Utilise une approche par backtracking avec une pile pour générer un labyrinthe connexe.
+    Chaque case est représentée comme un sommet dans un graphe. Les arcs du graphe
+    correspondent aux passages entre cases (destruction des murs).
+    Le parcours lui-même est délégué à generer_grille.
+    La représentation est choisie avant toute allocation selon le budget (voir
+    memoire.choisir_representation) : matrice d'adjacence tant qu'elle tient, sinon grille
+    de bits, éventuellement projetée en mémoire.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un objet GrapheM (ou GrapheGrille pour les grands labyrinthes) représentant le labyrinthe généré.
+    ------------------------------------------------------------------------------------------------
+    Exceptions :
+    - ValueError si aucune représentation ne tient dans le budget.
+    """
+    representation = choisir_representation(l, h, budget, supplement=supplement)
+    g = generer_grille(l, h, grille_vide(representation, l, h))
+    if tressage or salles:
+        tresser(g, tressage, salles)
+    return convertir(g, representation)
@@ -1,9 +1,22 @@
 import pygame
 import traceback
+from itertools import chain
 from pygame.locals import *
 import sys
+import numpy as np
 from algorithmes import *
 from labyrinthe import generer_laby
+from profilage import Profileur
+from widgets import Bouton
+from ordonnanceur import Ordonnanceur
+from traces import Trace, enregistrer_trace
+from solveurs_memoire import suivre_mur_simplifie, pledge_simplifie, tremaux_chemin
+from remplissage import remplissage, remplissage_chemin
+from replanification import LPAEtoile
+from analyse import murs_numpy
+from foule import Foule, RenduFoule
+from images import indices_labyrinthe, surface_labyrinthe, exporter_image
+from memoire import representer, cout_interface
 
 
 TAILLE_FENETRE = 700
@@ -13,29 +26,41 @@ BUTTON_TAILLE = pygame.Rect(TAILLE_FENETRE + 10, 150, 220, 50)
 BUTTON_DIJKSTRA = pygame.Rect(TAILLE_FENETRE + 10, 220, 220, 50)
 BUTTON_ASTAR = pygame.Rect(TAILLE_FENETRE + 10, 290, 220, 50)
 BUTTON_SYNCHRO = pygame.Rect(TAILLE_FENETRE + 10, 360, 220, 50)
-
-
-def afficher_entree_sortie(fenetre, laby):
+POSITION_PROFILEUR = (TAILLE_FENETRE + 10, 430)
+ZONE_LABYRINTHE = pygame.Rect(0, 0, TAILLE_FENETRE, TAILLE_FENETRE)
+ZONE_PROFILEUR = pygame.Rect(TAILLE_FENETRE, 420, 250, TAILLE_FENETRE - 420)
+
+BOUTONS = {
+    "chemin": Bouton(BUTTON_CHEMIN),
+    "jouer": Bouton(BUTTON_JOUER),
+    "taille": Bouton(BUTTON_TAILLE),
+    "dijkstra": Bouton(BUTTON_DIJKSTRA, (10, 10)),
+    "astar": Bouton(BUTTON_ASTAR, (10, 10)),
+    "synchro": Bouton(BUTTON_SYNCHRO, (10, 10)),
+}
+NB_IMAGES_PROFIL = 120
+IPS_ANIMATION = 100 # une étape d'animation par image, soit 10 ms par étape
+
+
+def afficher_entree_sortie(fenetre, laby, entrees=None, sorties=None):
     """
-    Affiche l'entrée (en vert) et la sortie (en rouge) du labyrinthe.
+    Affiche les entrées (en vert) et les sorties (en rouge) du labyrinthe.
     ------------------------------------------------------------------------------------------------
     Prend en entrée :
     - fenetre : La surface Pygame où dessiner.
     - laby : Le labyrinthe sous forme de graphe.
+    - entrees : Les cases d'entrée (par défaut la case 0).
+    - sorties : Les cases de sortie (par défaut la dernière case).
     ------------------------------------------------------------------------------------------------
-    Dessine des cercles représentant l'entrée et la sortie du labyrinthe sur la surface donnée.
+    Dessine des cercles représentant les entrées et les sorties du labyrinthe sur la surface donnée.
     """
     TAILLE_CASE_X = TAILLE_FENETRE / laby.l
     TAILLE_CASE_Y = TAILLE_FENETRE / laby.h
-    # coordonnées de l'entrée (0, 0)
-    x_entree, y_entree = 0, 0
-    # coordonnées de la sortie (h-1, l-1)
-    x_sortie, y_sortie = (laby.l - 1) * TAILLE_CASE_X, (laby.h - 1) * TAILLE_CASE_Y
-
-    # Dessine l'entrée en vert
-    pygame.draw.circle(fenetre, (0, 255, 0), (TAILLE_CASE_X // 2, TAILLE_CASE_Y // 2), min(TAILLE_CASE_X, TAILLE_CASE_Y) // 4)
-    # Dessine la sortie en rouge
-    pygame.draw.circle(fenetre, (255, 0, 0), (x_sortie + TAILLE_CASE_X // 2, y_sortie + TAILLE_CASE_Y // 2), min(TAILLE_CASE_X, TAILLE_CASE_Y) // 4)
+    rayon = min(TAILLE_CASE_X, TAILLE_CASE_Y) // 4
+    for cases, couleur in ((entrees or [0], (0, 255, 0)), (sorties or [laby.l * laby.h - 1], (255, 0, 0))):
+        for s in cases:
+            x, y = (s % laby.l) * TAILLE_CASE_X, (s // laby.l) * TAILLE_CASE_Y
+            pygame.draw.circle(fenetre, couleur, (x + TAILLE_CASE_X // 2, y + TAILLE_CASE_Y // 2), rayon)
 
 
 def afficher_laby(fenetre, laby):
@@ -47,7 +72,12 @@ def afficher_laby(fenetre, laby):
     - laby : Le labyrinthe sous forme de graphe avec une matrice d'adjacence.
     ------------------------------------------------------------------------------------------------
     Trace les murs en blanc pour chaque case en fonction de la matrice d'adjacence du labyrinthe.
+    Les labyrinthes sans matrice (grilles de bits choisies par generer_laby pour les grandes
+    tailles) sont dessinés d'un seul bloc à partir de leur image (voir afficher_laby_image).
     """
+    if not hasattr(laby, "adj"):
+        afficher_laby_image(fenetre, laby)
+        return
     TAILLE_CASE_X = (TAILLE_FENETRE - 3) / laby.l # décalage pour pouvoir voir les bords
     TAILLE_CASE_Y = (TAILLE_FENETRE - 3) / laby.h
 
@@ -84,33 +114,52 @@ def afficher_laby(fenetre, laby):
                 pygame.draw.line(fenetre, (255, 255, 255), dep, fin, 1)
 
 
-def trouver_chemin(laby, début, fin):
+def afficher_laby_image(fenetre, laby):
     """
-    Trouve un chemin reliant une position de départ à une position finale dans le labyrinthe.
+    Trace le labyrinthe en une seule copie d'image, sans parcourir ses arcs un par un.
     ------------------------------------------------------------------------------------------------
     Prend en entrée :
-    - laby : Le labyrinthe représenté sous forme de graphe.
-    - début : Le sommet de départ.
-    - fin : Le sommet de fin.
+    - fenetre : La surface Pygame où dessiner.
+    - laby : Le labyrinthe (GrapheGrille ou tout graphe l x h possédant une méthode arc).
+    """
+    indices = indices_labyrinthe(laby)
+    surface = pygame.transform.scale(surface_labyrinthe(indices, PALETTE_ECRAN), (TAILLE_FENETRE - 3, TAILLE_FENETRE - 3))
+    surface.set_colorkey((0, 0, 0))
+    fenetre.blit(surface, (0, 0))
+
+
+# Solveurs utilisés pour « Afficher Chemin », choisis avec la touche M
+SOLVEURS_CHEMIN = [
+    ("parcours en profondeur", trouver_chemin),
+    ("suivi de mur", suivre_mur_simplifie),
+    ("Pledge", pledge_simplifie),
+    ("Trémaux", tremaux_chemin),
+    ("remplissage des culs-de-sac", remplissage_chemin),
+]
+COULEUR_REMPLISSAGE = (90, 40, 120)
+# murs blancs sur fond noir (transparent) pour l'affichage des grandes grilles
+PALETTE_ECRAN = ((0, 0, 0), (255, 255, 255))
+
+
+def surface_remplissage(masque):
+    """
+    Prépare la superposition des cases comblées par le remplissage des culs-de-sac.
     ------------------------------------------------------------------------------------------------
-    Renvoie un chemin sous forme de liste de sommets allant de début à fin, ou None si aucun chemin n'existe.
+    Prend en entrée :
+    - masque : Tableau booléen (h, l) des cases comblées (voir remplissage.py).
+    ------------------------------------------------------------------------------------------------
+    Le masque est converti en image d'un pixel par case avec pygame.surfarray, puis agrandi
+    à la taille du labyrinthe : la superposition s'affiche ensuite en un seul blit.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une surface Pygame semi-transparente, noire (donc invisible) hors des cases comblées.
     """
-    pile = [(début, [début])]
-    deja_visite = set()
-
-    while pile:
-        (sommet, chemin) = pile.pop()
-        if sommet in deja_visite:
-            continue
-
-        if sommet == fin:
-            return chemin
-
-        deja_visite.add(sommet)
-        for voisin in laby.voisins(sommet):
-            if voisin not in deja_visite:
-                pile.append((voisin, chemin + [voisin]))
-    return None
+    pixels = masque.T[:, :, None] * np.array(COULEUR_REMPLISSAGE, dtype=np.uint8)
+    surface = pygame.surfarray.make_surface(pixels)
+    surface = pygame.transform.scale(surface, (TAILLE_FENETRE - 3, TAILLE_FENETRE - 3))
+    surface.set_colorkey((0, 0, 0))
+    surface.set_alpha(160)
+    return surface
 
 
 def afficher_chemin(fenetre, laby, chemin, couleur, jouer):
@@ -137,7 +186,8 @@ def afficher_chemin(fenetre, laby, chemin, couleur, jouer):
         pygame.draw.line(fenetre, couleur, (x1, y1), (x2, y2), 3)
     if jouer:
         if len(chemin) <= 1:
-            (x2, y2) = (TAILLE_CASE_X // 2, TAILLE_CASE_Y // 2)
+            (x2, y2) = ((chemin[0] % laby.l) * TAILLE_CASE_X + TAILLE_CASE_X // 2,
+                        (chemin[0] // laby.l) * TAILLE_CASE_Y + TAILLE_CASE_Y // 2)
         pygame.draw.circle(fenetre, (255, 255, 255), (x2, y2), TAILLE_CASE_X / 3)
 
 
@@ -155,36 +205,17 @@ def dessiner_boutons(fenetre, afficher, jouer):
     - Jouer/arrêter de jouer.
     - Changer la taille du labyrinthe.
     - Voir les algorithmes Dijkstra et A*.
+    Les libellés sont rendus une seule fois (voir widgets) et un bouton n'est redessiné
+    que lorsque son état change : le panneau latéral ne coûte presque rien par image.
     """
-    couleur = (50, 230, 50) if afficher else (255, 0, 0)
-    pygame.draw.rect(fenetre, couleur, BUTTON_CHEMIN)
-    font = pygame.font.Font(None, 36)
-    text = font.render('Afficher Chemin' if not afficher else 'Masquer Chemin', True, (255, 255, 255))
-    fenetre.blit(text, (BUTTON_CHEMIN.x + 13, BUTTON_CHEMIN.y + 12))
-
-    couleur = (255, 0, 0) if jouer else (0, 0, 225)
-    pygame.draw.rect(fenetre, couleur, BUTTON_JOUER)
-    font = pygame.font.Font(None, 36)
-    text = font.render('Jouer' if not jouer else 'Arrêter', True, (255, 255, 255))
-    fenetre.blit(text, (BUTTON_JOUER.x + 13, BUTTON_JOUER.y + 12))
-
-    couleur = (255, 0, 0) 
-    pygame.draw.rect(fenetre, couleur, BUTTON_TAILLE)
-    font = pygame.font.Font(None, 36)
-    text = font.render('Taille (console)', True, (255, 255, 255))
-    fenetre.blit(text, (BUTTON_TAILLE.x + 13, BUTTON_TAILLE.y + 12))
-
-    pygame.draw.rect(fenetre, (0, 255, 0), BUTTON_DIJKSTRA)
-    text = font.render('Afficher Dijkstra', True, (255, 255, 255))
-    fenetre.blit(text, (BUTTON_DIJKSTRA.x + 10, BUTTON_DIJKSTRA.y + 10))
-
-    pygame.draw.rect(fenetre, (255, 0, 0), BUTTON_ASTAR)
-    text = font.render('Afficher A*', True, (255, 255, 255))
-    fenetre.blit(text, (BUTTON_ASTAR.x + 10, BUTTON_ASTAR.y + 10))
-
-    pygame.draw.rect(fenetre, (0, 0, 255), BUTTON_SYNCHRO)
-    text = font.render('Afficher Synchro', True, (255, 255, 255))
-    fenetre.blit(text, (BUTTON_SYNCHRO.x + 10, BUTTON_SYNCHRO.y + 10))
+    BOUTONS["chemin"].dessiner(fenetre, 'Afficher Chemin' if not afficher else 'Masquer Chemin',
+                               (50, 230, 50) if afficher else (255, 0, 0))
+    BOUTONS["jouer"].dessiner(fenetre, 'Jouer' if not jouer else 'Arrêter',
+                              (255, 0, 0) if jouer else (0, 0, 225))
+    BOUTONS["taille"].dessiner(fenetre, 'Taille (console)', (255, 0, 0))
+    BOUTONS["dijkstra"].dessiner(fenetre, 'Afficher Dijkstra', (0, 255, 0))
+    BOUTONS["astar"].dessiner(fenetre, 'Afficher A*', (255, 0, 0))
+    BOUTONS["synchro"].dessiner(fenetre, 'Afficher Synchro', (0, 0, 255))
 
 
 def afficher_etapes(fenetre, laby, chemin, couleur):
@@ -213,17 +244,30 @@ def afficher_etapes(fenetre, laby, chemin, couleur):
         pygame.time.wait(10) 
 
 
-def afficher_etapes_dijkstra(fenetre, laby, étapes_dijkstra):
+def pause(duree):
+    """
+    Générateur d'images vides, pour marquer une pause dans une animation.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - duree : Durée de la pause en millisecondes, à la cadence IPS_ANIMATION.
+    """
+    for _ in range(duree * IPS_ANIMATION // 1000):
+        yield
+
+
+def afficher_etapes_dijkstra(fenetre, laby, étapes_dijkstra, chemin=None):
     """
     Affiche les étapes de l'algorithme de Dijkstra sur le labyrinthe.
     ------------------------------------------------------------------------------------------------
     Prend en entrée :
     - fenetre : La surface Pygame où dessiner.
     - laby : Le labyrinthe représenté sous forme de graphe.
-    - étapes_dijkstra : Une liste de sommets représentant les étapes du parcours de Dijkstra.
+    - étapes_dijkstra : Les sommets (liste ou Trace lue en flux) des étapes du parcours de Dijkstra.
+    - chemin : Le chemin trouvé par Dijkstra, recalculé s'il n'est pas fourni.
     ------------------------------------------------------------------------------------------------
     Affiche chaque étape de Dijkstra en dessinant des cercles verts sur le labyrinthe. 
     Le chemin final trouvé par Dijkstra est ensuite affiché.
+    Générateur : chaque itération dessine une étape, l'affichage et le délai étant laissés à la boucle principale.
     """
     TAILLE_CASE_X = TAILLE_FENETRE / laby.l
     TAILLE_CASE_Y = TAILLE_FENETRE / laby.h
@@ -234,24 +278,26 @@ def afficher_etapes_dijkstra(fenetre, laby, étapes_dijkstra):
         y1_d = (dijkstra_pos // laby.l) * TAILLE_CASE_Y + TAILLE_CASE_Y // 2
         pygame.draw.circle(fenetre, (0, 255, 0), (x1_d + 1, y1_d + 1), TAILLE_CASE_X / 4)
 
-        pygame.display.flip()
-        pygame.time.wait(10)  # Délai pour observer la progression
-    afficher_chemin(fenetre, laby, dijkstra(laby, 0, laby.l * laby.h - 1), (0, 255, 0), False)
-    pygame.time.wait(1000)
-    afficher = False
+        yield # l'image est affichée et cadencée par la boucle principale
+    if chemin is None:
+        chemin = dijkstra(laby, 0, laby.l * laby.h - 1)
+    afficher_chemin(fenetre, laby, chemin, (0, 255, 0), False)
+    yield from pause(1000)
 
 
-def afficher_etapes_astar(fenetre, laby, étapes_astar):
+def afficher_etapes_astar(fenetre, laby, étapes_astar, chemin=None):
     """
     Affiche les étapes de l'algorithme A* sur le labyrinthe.
     ------------------------------------------------------------------------------------------------
     Prend en entrée :
     - fenetre : La surface Pygame où dessiner.
     - laby : Le labyrinthe représenté sous forme de graphe.
-    - étapes_astar : Une liste de sommets représentant les étapes du parcours de A*.
+    - étapes_astar : Les sommets (liste ou Trace lue en flux) des étapes du parcours de A*.
+    - chemin : Le chemin trouvé par A*, recalculé s'il n'est pas fourni.
     ------------------------------------------------------------------------------------------------
     Affiche chaque étape de A* en dessinant des cercles rouges sur le labyrinthe.
     Le chemin final trouvé par A* est ensuite affiché.
+    Générateur : chaque itération dessine une étape, l'affichage et le délai étant laissés à la boucle principale.
     """
     TAILLE_CASE_X = TAILLE_FENETRE / laby.l
     TAILLE_CASE_Y = TAILLE_FENETRE / laby.h
@@ -262,13 +308,14 @@ def afficher_etapes_astar(fenetre, laby, étapes_astar):
         y1_a = (astar_pos // laby.l) * TAILLE_CASE_Y + TAILLE_CASE_Y // 2
         pygame.draw.circle(fenetre, (255, 0, 0), (x1_a - 1, y1_a - 1), TAILLE_CASE_X / 4)
         
-        pygame.display.flip()
-        pygame.time.wait(10)  # Délai pour observer la progression
-    afficher_chemin(fenetre, laby, astar(laby, 0, laby.l * laby.h - 1), (255, 0, 0), False)
-    pygame.time.wait(1000)  
+        yield # l'image est affichée et cadencée par la boucle principale
+    if chemin is None:
+        chemin = astar(laby, 0, laby.l * laby.h - 1)
+    afficher_chemin(fenetre, laby, chemin, (255, 0, 0), False)
+    yield from pause(1000)
 
             
-def afficher_etapes_paralleles(fenetre, laby, étapes_dijkstra, étapes_astar):
+def afficher_etapes_paralleles(fenetre, laby, étapes_dijkstra, étapes_astar, chemin=None):
     """
     Affiche les étapes des algorithmes de Dijkstra et A* en parallèle sur le labyrinthe.
     ------------------------------------------------------------------------------------------------
@@ -277,9 +324,11 @@ def afficher_etapes_paralleles(fenetre, laby, étapes_dijkstra, étapes_astar):
     - laby : Le labyrinthe représenté sous forme de graphe.
     - étapes_dijkstra : Une liste de sommets représentant les étapes du parcours de Dijkstra.
     - étapes_astar : Une liste de sommets représentant les étapes du parcours de A*.
+    - chemin : Le plus court chemin, recalculé s'il n'est pas fourni.
     ------------------------------------------------------------------------------------------------
     Affiche simultanément les étapes de Dijkstra (cercles verts) et de A* (cercles rouges).
-    Le chemin final trouvé est ensuite affiché avec une couleur différente (cyan).
+    Le plus court chemin est ensuite affiché avec une couleur différente (cyan).
+    Générateur : chaque itération dessine une étape, l'affichage et le délai étant laissés à la boucle principale.
     """
     TAILLE_CASE_X = TAILLE_FENETRE / laby.l
     TAILLE_CASE_Y = TAILLE_FENETRE / laby.h
@@ -295,10 +344,96 @@ def afficher_etapes_paralleles(fenetre, laby, étapes_dijkstra, étapes_astar):
         y1_a = (astar_pos // laby.l) * TAILLE_CASE_Y + TAILLE_CASE_Y // 2
         pygame.draw.circle(fenetre, (255, 0, 0), (x1_a - 1, y1_a - 1), TAILLE_CASE_X / 4)
         
-        pygame.display.flip()
-        pygame.time.wait(10)  # Délai pour observer la progression
-    afficher_chemin(fenetre, laby, trouver_chemin(laby, 0, laby.l * laby.h - 1), (0, 255, 255), False)
-    pygame.time.wait(1000)
+        yield # l'image est affichée et cadencée par la boucle principale
+    if chemin is None:
+        chemin = dijkstra(laby, 0, laby.l * laby.h - 1)
+    afficher_chemin(fenetre, laby, chemin, (0, 255, 255), False)
+    yield from pause(1000)
+
+
+def afficher_foule(fenetre, laby, nb_agents=None, sortie=None):
+    """
+    Simule une foule d'agents qui évacue le labyrinthe par la sortie (voir foule.py).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - fenetre : La surface Pygame où dessiner.
+    - laby : Le labyrinthe représenté sous forme de graphe.
+    - nb_agents : Nombre d'agents (par défaut, un quart des cases).
+    - sortie : La case de sortie (par défaut la dernière case).
+    ------------------------------------------------------------------------------------------------
+    Générateur : chaque itération avance la foule d'un pas et redessine labyrinthe et agents
+    en un seul blit, jusqu'à ce que tous les agents soient sortis ou qu'aucun ne puisse plus
+    avancer.
+    """
+    murs = murs_numpy(laby)
+    foule = Foule(murs, nb_agents or laby.l * laby.h // 4, sortie)
+    rendu = RenduFoule(murs, (TAILLE_FENETRE - 3, TAILLE_FENETRE - 3), foule.sortie)
+    while foule.positions.size:
+        if not foule.pas():
+            break # foule bloquée
+        rendu.dessiner(fenetre, foule)
+        yield
+    yield from pause(1000)
+
+
+def mur_sous_curseur(laby, position):
+    """
+    Détermine le mur le plus proche d'un point de la fenêtre.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe représenté sous forme de graphe.
+    - position : Les coordonnées (x, y) du clic.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le couple (s1, s2) des cases séparées par ce mur, ou None s'il s'agit d'un mur extérieur.
+    """
+    fx = position[0] / ((TAILLE_FENETRE - 3) / laby.l)
+    fy = position[1] / ((TAILLE_FENETRE - 3) / laby.h)
+    i, j = int(fy), int(fx)
+    if not (0 <= i < laby.h and 0 <= j < laby.l):
+        return None
+    s = i * laby.l + j
+    # distances du point aux quatre bords de la case
+    bords = [(fx - j, -1, j > 0), (j + 1 - fx, 1, j < laby.l - 1),
+             (fy - i, -laby.l, i > 0), (i + 1 - fy, laby.l, i < laby.h - 1)]
+    _, decalage, interieur = min(bords)
+    return (s, s + decalage) if interieur else None
+
+
+def case_sous_curseur(laby, position):
+    """Renvoie la case du labyrinthe sous le point position de la fenêtre, ou None."""
+    j = int(position[0] / ((TAILLE_FENETRE - 3) / laby.l))
+    i = int(position[1] / ((TAILLE_FENETRE - 3) / laby.h))
+    if not (0 <= i < laby.h and 0 <= j < laby.l):
+        return None
+    return i * laby.l + j
+
+
+def basculer_case(cases, s):
+    """Ajoute la case s à la liste cases, ou l'en retire s'il en reste au moins une autre."""
+    if s not in cases:
+        cases.append(s)
+    elif len(cases) > 1:
+        cases.remove(s)
+
+
+def rechercher(laby, entrees, sorties):
+    """
+    Lance Dijkstra et A* depuis toutes les entrées vers toutes les sorties (une recherche chacun).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe représenté sous forme de graphe.
+    - entrees, sorties : Les listes des cases d'entrée et de sortie.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le couple (début, fin) le plus proche, que suivent les solveurs à deux extrémités
+      (couple par défaut s'il n'y a aucun chemin).
+    - Le chemin et les étapes de Dijkstra, puis ceux de A*.
+    """
+    chemin_dijkstra, étapes_dijkstra, paire = dijkstra_multi_etapes(laby, entrees, sorties)
+    chemin_astar, étapes_astar, _ = astar_multi_etapes(laby, entrees, sorties)
+    début, fin = paire or (entrees[0], sorties[0])
+    return début, fin, chemin_dijkstra, étapes_dijkstra, chemin_astar, étapes_astar
 
 
 def calcul_sommet(laby, sommet, nouveau_sommet):
@@ -320,7 +455,7 @@ def calcul_sommet(laby, sommet, nouveau_sommet):
     return sommet
 
 
-def interface():
+def interface(fichiers_traces=()):
     """
     Initialise et gère l'interface graphique Pygame.
     ------------------------------------------------------------------------------------------------
@@ -328,58 +463,98 @@ def interface():
     - De générer un labyrinthe aléatoire.
     - D'afficher et interagir avec le labyrinthe via des boutons et le clavier.
     - De visualiser les étapes des algorithmes (Dijkstra, A*) et de comparer leurs résultats.
+    - D'afficher le temps passé par phase (touche F3) et d'enregistrer des images sous cProfile (touche F4).
+    - D'enregistrer les explorations de Dijkstra et A* (touche S) ou de rejouer des traces enregistrées.
+    - De choisir le solveur du chemin affiché (touche M), dont les solveurs à mémoire constante.
+    - De superposer les culs-de-sac comblés par le remplissage (touche F).
+    - De simuler l'évacuation d'une foule d'agents (touche C).
+    - D'ouvrir ou fermer des murs à la souris (mode édition, touche E), le plus court chemin
+      étant réparé à chaque clic par LPA* (voir replanification.py) au lieu d'être recalculé.
+    - De placer plusieurs entrées (clic gauche) et sorties (clic droit) en mode placement
+      (touche I) : Dijkstra et A* partent de toutes les entrées à la fois et s'arrêtent à la
+      première sortie atteinte ; les autres solveurs relient ce couple le plus proche.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - fichiers_traces : Fichiers de traces (voir traces.py) optionnels. Le labyrinthe est alors
+      celui des traces, dont les étapes sont rejouées en flux sans relancer la recherche.
     ------------------------------------------------------------------------------------------------
     Lancement automatique de l'interface utilisateur avec Pygame.
     """
     pygame.init()
     try:
         fenetre = pygame.display.set_mode((TAILLE_FENETRE + 250, TAILLE_FENETRE))
-        laby = generer_laby(50, 50)
+        traces = {}
+        for fichier in fichiers_traces:
+            trace = Trace(fichier)
+            traces[trace.stats.get("algorithme", "dijkstra")] = trace
+        if traces:
+            laby = representer(next(iter(traces.values())).labyrinthe())
+        else:
+            laby = generer_laby(50, 50)
         pygame.display.set_caption(f"Labyrinthe {laby.l}×{laby.h}")
         afficher_laby(fenetre, laby)
         afficher_entree_sortie(fenetre, laby)
 
         sommet = 0
-        début = 0
-        fin = laby.l * laby.h - 1
-
-        _, étapes_dijkstra = dijkstra_etapes(laby, début, fin)
-        _, étapes_astar = astar_etapes(laby, début, fin)
+        entrees = [0]
+        sorties = [laby.l * laby.h - 1]
+        début, fin, chemin_dijkstra, étapes_dijkstra, chemin_astar, étapes_astar = rechercher(laby, entrees, sorties)
+
+        if "dijkstra" in traces:
+            étapes_dijkstra, chemin_dijkstra = traces["dijkstra"], traces["dijkstra"].chemin
+        if "astar" in traces:
+            étapes_astar, chemin_astar = traces["astar"], traces["astar"].chemin
         
+        solveur = 0
         chemin = trouver_chemin(laby, début, fin)
-        chemin_dijkstra = dijkstra(laby, début, fin)
-        chemin_astar = astar(laby, début, fin)
         chemin_joueur = [0]
         
         afficher = False
         afficher_dijkstra = False
         afficher_astar = False
         afficher_synchro = False
+        afficher_remplissage = False
+        afficher_foule_active = False
+        remplissage_affiche = None # surface de superposition, recalculée si le labyrinthe change
+        replanification = None # recherche incrémentale du mode édition
+        chemin_edition = None
+        placement = False # mode placement des entrées et sorties
         jouer = False
 
         continuer = True
         ok = True
+        profileur = Profileur()
+        ordonnanceur = Ordonnanceur(IPS_ANIMATION)
+        redessiner = True
+        animation = None
 
         while continuer:
-            fenetre.fill((0, 0, 0))
-            afficher_laby(fenetre, laby)
-            afficher_entree_sortie(fenetre, laby)
-            dessiner_boutons(fenetre, afficher, jouer)
-            if afficher and chemin:
-                afficher_chemin(fenetre, laby, chemin, (255, 255, 0), jouer)
-            if afficher_dijkstra and chemin_dijkstra:
-                afficher_etapes_dijkstra(fenetre, laby, étapes_dijkstra)
-            if afficher_astar and chemin_astar:
-                afficher_etapes_astar(fenetre, laby, étapes_astar)
-            if afficher_synchro:
-                afficher_etapes_paralleles(fenetre, laby, étapes_dijkstra, étapes_astar)
-            if jouer:
-                afficher_chemin(fenetre, laby, chemin_joueur, (33, 130, 42), jouer)
-
-            for event in pygame.event.get():
+            profileur.basculer("attente")
+            evenements = ordonnanceur.evenements(animation is not None)
+            profileur.basculer("événements")
+            for event in evenements:
+                if event.type in (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+                    redessiner = True
                 if event.type == pygame.QUIT:
                         continuer = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if replanification and ZONE_LABYRINTHE.collidepoint(event.pos):
+                        mur = mur_sous_curseur(laby, event.pos)
+                        if mur:
+                            replanification.basculer_mur(*mur)
+                            chemin_edition = replanification.chemin()
+                            remplissage_affiche = None
+                    elif placement and ZONE_LABYRINTHE.collidepoint(event.pos):
+                        case = case_sous_curseur(laby, event.pos)
+                        if case is not None and event.button in (1, 3):
+                            basculer_case(entrees if event.button == 1 else sorties, case)
+                            début, fin, chemin_dijkstra, étapes_dijkstra, chemin_astar, étapes_astar = \
+                                rechercher(laby, entrees, sorties)
+                            chemin = SOLVEURS_CHEMIN[solveur][1](laby, début, fin)
+                            chemin_joueur = [début]
+                            sommet = début
+                            remplissage_affiche = None
+
                     if BUTTON_CHEMIN.collidepoint(event.pos):
                         afficher = not afficher
                         afficher_astar = False
@@ -405,8 +580,8 @@ def interface():
                         afficher_dijkstra = False
                     
                     if BUTTON_JOUER.collidepoint(event.pos):
-                        chemin_joueur = [0]
-                        sommet = 0
+                        chemin_joueur = [début]
+                        sommet = début
                         jouer = not jouer
                         afficher = False
                         afficher_astar = False
@@ -416,17 +591,25 @@ def interface():
                     if BUTTON_TAILLE.collidepoint(event.pos):
                         longueur = int(input("Quelle longueur ? "))
                         hauteur = int(input("Quelle hauteur ? "))
+                        tressage = float(input("Proportion de culs-de-sac à supprimer (0 à 1, Entrée pour 0) ? ") or 0)
                         print()
-                        laby = generer_laby(longueur, hauteur)
+                        try:
+                            # la place des recherches et de l'image est réservée avant de générer
+                            laby = generer_laby(longueur, hauteur, tressage,
+                                                supplement=cout_interface(longueur, hauteur))
+                        except ValueError as erreur:
+                            print(erreur)
+                            continue
                         pygame.display.set_caption(f"Labyrinthe {laby.l}×{laby.h}")
-                        fin = laby.l * laby.h - 1
-                        chemin = trouver_chemin(laby, début, fin)
-                        chemin_dijkstra = dijkstra(laby, début, fin)
-                        chemin_astar = astar(laby, début, fin)
-                        chemin_joueur = [0]
-                        sommet = 0
-                        _, étapes_dijkstra = dijkstra_etapes(laby, début, fin)
-                        _, étapes_astar = astar_etapes(laby, début, fin)
+                        entrees = [0]
+                        sorties = [laby.l * laby.h - 1]
+                        début, fin, chemin_dijkstra, étapes_dijkstra, chemin_astar, étapes_astar = \
+                            rechercher(laby, entrees, sorties)
+                        chemin = SOLVEURS_CHEMIN[solveur][1](laby, début, fin)
+                        chemin_joueur = [début]
+                        sommet = début
+                        remplissage_affiche = None
+                        replanification = None
                         
                 if event.type==pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
@@ -438,6 +621,50 @@ def interface():
                         afficher_dijkstra = not afficher_dijkstra
                     if event.key==pygame.K_a:
                         afficher_astar = not afficher_astar
+                    if event.key == pygame.K_m:
+                        solveur = (solveur + 1) % len(SOLVEURS_CHEMIN)
+                        chemin = SOLVEURS_CHEMIN[solveur][1](laby, début, fin)
+                        print(f"Chemin calculé par : {SOLVEURS_CHEMIN[solveur][0]}")
+                    if event.key == pygame.K_e:
+                        if replanification is None:
+                            placement = False
+                            replanification = LPAEtoile(laby, début, fin)
+                            chemin_edition = replanification.chemin()
+                            print("Mode édition : cliquer près d'un mur pour l'ouvrir ou le fermer")
+                        else:
+                            # les murs ont pu changer : les autres résultats sont recalculés une fois
+                            replanification = None
+                            début, fin, chemin_dijkstra, étapes_dijkstra, chemin_astar, étapes_astar = \
+                                rechercher(laby, entrees, sorties)
+                            chemin = SOLVEURS_CHEMIN[solveur][1](laby, début, fin)
+                    if event.key == pygame.K_i:
+                        placement = not placement
+                        if placement:
+                            if replanification is not None:
+                                replanification = None
+                                début, fin, chemin_dijkstra, étapes_dijkstra, chemin_astar, étapes_astar = \
+                                    rechercher(laby, entrees, sorties)
+                                chemin = SOLVEURS_CHEMIN[solveur][1](laby, début, fin)
+                            print("Mode placement : clic gauche pour une entrée, clic droit pour une sortie")
+                    if event.key == pygame.K_p:
+                        fichier = f"labyrinthe_{laby.l}x{laby.h}.png"
+                        exporter_image(laby, fichier, chemin, pas=max(1, 700 // (2 * max(laby.l, laby.h) + 1)))
+                        print(f"Labyrinthe et chemin enregistrés dans {fichier}")
+                    if event.key == pygame.K_c:
+                        afficher_foule_active = not afficher_foule_active
+                    if event.key == pygame.K_f:
+                        afficher_remplissage = not afficher_remplissage
+                    if event.key == pygame.K_s:
+                        for nom, étapes, chemin_trouvé in (("dijkstra", étapes_dijkstra, chemin_dijkstra),
+                                                          ("astar", étapes_astar, chemin_astar)):
+                            enregistrer_trace(f"{nom}.trace", laby, list(étapes), chemin_trouvé, {"algorithme": nom})
+                        print("Traces enregistrées dans dijkstra.trace et astar.trace")
+                    if event.key == pygame.K_F3:
+                        profileur.visible = not profileur.visible
+                        fenetre.fill((0, 0, 0), ZONE_PROFILEUR)
+                    if event.key == pygame.K_F4:
+                        profileur.capturer(NB_IMAGES_PROFIL)
+                        print(f"Enregistrement de {NB_IMAGES_PROFIL} images sous cProfile...")
 
                     # Joueur
                     if jouer:
@@ -461,12 +688,58 @@ def interface():
                                     chemin_joueur.pop()
                                 else:
                                     chemin_joueur.append(sommet)
-                        if sommet == fin:
+                        if sommet in sorties:
                             print("Félicitations !!!")
                             jouer = False
                             afficher = True
                             
+            if not (redessiner or animation):
+                continue # attente terminée sans événement : rien à redessiner
+
+            if redessiner:
+                profileur.basculer("labyrinthe")
+                fenetre.fill((0, 0, 0), ZONE_LABYRINTHE)
+                afficher_laby(fenetre, laby)
+                afficher_entree_sortie(fenetre, laby, entrees, sorties)
+                profileur.basculer("boutons")
+                dessiner_boutons(fenetre, afficher, jouer)
+                profileur.basculer("superpositions")
+                if afficher_remplissage:
+                    if remplissage_affiche is None:
+                        remplissage_affiche = surface_remplissage(remplissage(laby, début, fin)[1])
+                    fenetre.blit(remplissage_affiche, (0, 0))
+                if replanification and chemin_edition:
+                    afficher_chemin(fenetre, laby, chemin_edition, (255, 140, 0), False)
+                elif afficher and chemin:
+                    afficher_chemin(fenetre, laby, chemin, (255, 255, 0), jouer)
+                if jouer:
+                    afficher_chemin(fenetre, laby, chemin_joueur, (33, 130, 42), jouer)
+                # les animations sont rejouées tant que leur affichage est activé
+                animations = []
+                if afficher_dijkstra and chemin_dijkstra:
+                    animations.append(afficher_etapes_dijkstra(fenetre, laby, étapes_dijkstra, chemin_dijkstra))
+                if afficher_astar and chemin_astar:
+                    animations.append(afficher_etapes_astar(fenetre, laby, étapes_astar, chemin_astar))
+                if afficher_synchro:
+                    animations.append(afficher_etapes_paralleles(fenetre, laby, étapes_dijkstra, étapes_astar,
+                                                                 chemin_dijkstra))
+                if afficher_foule_active:
+                    animations.append(afficher_foule(fenetre, laby, sortie=fin))
+                animation = chain(*animations) if animations else None
+                redessiner = False
+
+            profileur.basculer("superpositions")
+            if animation is not None and next(animation, StopIteration) is StopIteration:
+                animation = None
+                redessiner = True
+            if profileur.visible:
+                profileur.dessiner(fenetre, POSITION_PROFILEUR)
+
+            profileur.basculer("flip")
             pygame.display.flip()
+            fichier = profileur.fin_image()
+            if fichier:
+                print(f"Statistiques cProfile enregistrées dans {fichier}")
 
     except:
         traceback.print_exc()
@@ -481,4 +754,4 @@ if __name__ == "__main__":
 	from labyrinthe import *
 
 
-	interface()
+	interface(sys.argv[1:])
@@ -0,0 +1,175 @@
+import argparse
+import os
+from class_graphe import GrapheM, GrapheGrille, GrapheCSR, grille_projetee
+
+
+MO = 1 << 20
+# Budget mémoire par défaut (en octets), modifiable par la variable d'environnement LABYRINTHE_BUDGET_MO
+BUDGET_DEFAUT = int(float(os.environ.get("LABYRINTHE_BUDGET_MO", 512)) * MO)
+# Représentations par ordre de préférence : la matrice reste celle du code historique
+# (affichage, exercices), le CSR est le plus rapide à parcourir, la grille la plus compacte
+# et la grille projetée ne garde presque rien en mémoire vive.
+REPRESENTATIONS = ["matrice", "csr", "grille", "projetee"]
+MODIFIABLES = {"matrice", "grille", "projetee"}
+# GrapheD, GraphePondM et GraphePondD mesurent leur mémoire (méthode memoire) mais ne sont pas
+# candidats : ils ne décrivent pas une grille l x h et generer_laby ne les produit jamais.
+ESTIMATIONS = {
+    "matrice": GrapheM.memoire_estimee,
+    "csr": GrapheCSR.memoire_estimee,
+    "grille": GrapheGrille.memoire_estimee,
+}
+# Mémoire par case de l'interface graphique, mesurée avec tracemalloc sur des grilles tressées
+# (pire cas : la recherche visite toutes les cases)
+OCTETS_RECHERCHE = 270 # pic d'une recherche Dijkstra / A* avec étapes (dictionnaires, ensemble, tas)
+OCTETS_RESULTATS = 90 # étapes et chemins de Dijkstra et A* conservés pour les animations
+OCTETS_RENDU = 12 # image (2l+1) x (2h+1) des murs et surface 8 bits de afficher_laby_image
+
+
+def cout_generation(l, h):
+    """
+    Estime la mémoire de travail de generer_grille pour un labyrinthe l x h.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le nombre d'octets du tableau des cases vues (1 par case) et de la pile (4 par case).
+    """
+    return 5 * l * h
+
+
+def cout_interface(l, h):
+    """
+    Estime la mémoire que l'interface graphique alloue juste après avoir généré un labyrinthe l x h.
+    ------------------------------------------------------------------------------------------------
+    Les résultats de Dijkstra et A* restent en mémoire pour les animations ; une seule recherche
+    (ou un seul autre calcul à la demande, moins gourmand) est en cours à la fois.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un nombre d'octets, à passer comme supplement à choisir_representation.
+    """
+    return l * h * (OCTETS_RECHERCHE + OCTETS_RESULTATS + OCTETS_RENDU)
+
+
+def memoire_structure(representation, l, h):
+    """Estime la mémoire (en octets) d'un labyrinthe l x h dans une représentation (0 pour la grille projetée)."""
+    if representation == "projetee":
+        return 0
+    return ESTIMATIONS[representation](l, h)
+
+
+def memoire_estimee(representation, l, h):
+    """
+    Estime la mémoire vive nécessaire pour générer un labyrinthe l x h dans une représentation.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - representation : Un nom de REPRESENTATIONS.
+    - l, h : Dimensions du labyrinthe.
+    ------------------------------------------------------------------------------------------------
+    La génération creuse toujours une grille de bits : il faut compter la mémoire de travail
+    du générateur, la structure finale et, pour la matrice et le CSR, la grille intermédiaire.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un nombre d'octets.
+    """
+    total = cout_generation(l, h) + memoire_structure(representation, l, h)
+    if representation in ("matrice", "csr"):
+        total += GrapheGrille.memoire_estimee(l, h)
+    return total
+
+
+def choisir_representation(l, h, budget=None, modifiable=True, supplement=0):
+    """
+    Choisit la représentation d'un labyrinthe l x h selon un budget mémoire, avant toute allocation.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - l, h : Dimensions du labyrinthe.
+    - budget : Mémoire vive disponible en octets (par défaut BUDGET_DEFAUT).
+    - modifiable : Booléen ; s'il est vrai, le CSR (en lecture seule) est écarté.
+    - supplement : Mémoire en octets que l'appelant allouera en plus (voir cout_interface).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le premier nom de REPRESENTATIONS dont l'estimation tient dans le budget.
+    ------------------------------------------------------------------------------------------------
+    Exceptions :
+    - ValueError si les dimensions sont invalides ou si aucune représentation ne tient.
+    """
+    budget = BUDGET_DEFAUT if budget is None else budget
+    if l <= 0 or h <= 0:
+        raise ValueError(f"Dimensions invalides : {l}x{h}")
+    for representation in REPRESENTATIONS:
+        if modifiable and representation not in MODIFIABLES:
+            continue
+        if memoire_estimee(representation, l, h) + supplement <= budget:
+            return representation
+    raise ValueError(f"Labyrinthe {l}x{h} refusé : il faut au moins "
+                     f"{(memoire_estimee('projetee', l, h) + supplement) / MO:.0f} Mo "
+                     f"pour un budget de {budget / MO:.0f} Mo")
+
+
+def grille_vide(representation, l, h):
+    """Crée la grille fermée dans laquelle generer_grille creuse le labyrinthe."""
+    return grille_projetee(l, h) if representation == "projetee" else GrapheGrille(l, h)
+
+
+def convertir(g, representation):
+    """Renvoie le labyrinthe g (GrapheGrille) dans la représentation demandée."""
+    if representation == "matrice":
+        return g.vers_matrice()
+    if representation == "csr":
+        return g.vers_csr()
+    return g
+
+
+def representer(g, budget=None, modifiable=True):
+    """
+    Convertit une grille existante dans la meilleure représentation tenant dans le budget.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - g : Un GrapheGrille (par exemple lu dans une trace ou un fichier).
+    - budget, modifiable : Voir choisir_representation.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le labyrinthe converti, ou g lui-même s'il n'y a rien de mieux à faire.
+    """
+    representation = choisir_representation(g.l, g.h, budget, modifiable)
+    return convertir(g, "grille" if representation == "projetee" else representation)
+
+
+def rapport(l, h, budget=None):
+    """
+    Compare mémoire estimée et mémoire réelle des représentations d'un labyrinthe l x h.
+    ------------------------------------------------------------------------------------------------
+    Les représentations dont l'estimation dépasse le budget ne sont pas construites.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères contenant le tableau et la représentation choisie.
+    """
+    from labyrinthe import generer_grille
+    budget = BUDGET_DEFAUT if budget is None else budget
+    lignes = ["{:<10} {:>14} {:>14} {:>16}".format("", "estimée (Mo)", "réelle (Mo)", "avec génération")]
+    for representation in REPRESENTATIONS:
+        estimee = memoire_estimee(representation, l, h)
+        structure = memoire_structure(representation, l, h)
+        reelle = "-"
+        if estimee <= budget:
+            g = convertir(generer_grille(l, h, grille_vide(representation, l, h)), representation)
+            reelle = f"{g.memoire() / MO:.2f}"
+        lignes.append(f"{representation:<10} {structure / MO:>14.2f} {reelle:>14} {estimee / MO:>16.2f}")
+    try:
+        choix = choisir_representation(l, h, budget)
+    except ValueError as erreur:
+        choix = str(erreur)
+    lignes.append(f"Budget {budget / MO:.0f} Mo : {choix}")
+    try:
+        choix = choisir_representation(l, h, budget, supplement=cout_interface(l, h))
+    except ValueError as erreur:
+        choix = str(erreur)
+    lignes.append(f"Interface graphique (+{cout_interface(l, h) / MO:.0f} Mo) : {choix}")
+    return "\n".join(lignes)
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Mémoire des représentations de labyrinthes.")
+    parseur.add_argument("l", type=int)
+    parseur.add_argument("h", type=int)
+    parseur.add_argument("--budget", type=float, default=None, help="budget en Mo")
+    args = parseur.parse_args()
+    print(rapport(args.l, args.h, None if args.budget is None else int(args.budget * MO)))
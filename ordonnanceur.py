@@ -0,0 +1,48 @@
+import pygame
+
+
+class Ordonnanceur:
+    """
+    Cadence la boucle principale de l'interface graphique.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - ips : Nombre maximal d'images par seconde pendant une animation.
+    - attente_max : Durée maximale (en ms) d'attente d'un événement lorsque rien n'est animé.
+    - horloge : Horloge Pygame utilisée pour limiter la cadence des animations.
+    ------------------------------------------------------------------------------------------------
+    Sans animation, la boucle est bloquée dans pygame.event.wait jusqu'au prochain événement :
+    le processeur reste au repos sans ajouter de latence. Pendant une animation, les événements
+    sont relevés sans attendre et la cadence est limitée par Clock.tick.
+    """
+
+    def __init__(self, ips=100, attente_max=500):
+        """
+        Initialise l'ordonnanceur.
+        ------------------------------------------------------------------------------------------------
+        Paramètres :
+        - ips : Nombre maximal d'images par seconde pendant une animation.
+        - attente_max : Durée maximale (en ms) d'attente d'un événement au repos.
+        """
+        self.ips = ips
+        self.attente_max = attente_max
+        self.horloge = pygame.time.Clock()
+
+    def evenements(self, anime):
+        """
+        Attend si besoin, puis renvoie les événements en attente.
+        ------------------------------------------------------------------------------------------------
+        Prend en entrée :
+        - anime : Booléen indiquant si une animation est en cours.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - La liste des événements Pygame à traiter (vide si l'attente a expiré).
+        """
+        if anime:
+            self.horloge.tick(self.ips)
+            return pygame.event.get()
+        evenement = pygame.event.wait(self.attente_max)
+        # remet l'horloge à zéro pour que la prochaine animation ne rattrape pas l'attente
+        self.horloge.tick()
+        if evenement.type == pygame.NOEVENT:
+            return []
+        return [evenement] + pygame.event.get()
@@ -0,0 +1,101 @@
+import cProfile
+import pstats
+import time
+import pygame
+
+
+PHASES = ("attente", "événements", "labyrinthe", "boutons", "superpositions", "flip")
+
+
+class Profileur:
+    """
+    Mesure le temps passé dans chaque phase d'une image de l'interface graphique.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - visible : Booléen indiquant si l'incrustation (FPS et ms par phase) est affichée.
+    - moyennes : Dictionnaire {phase: durée moyenne en ms}, lissée exponentiellement.
+    - ips : Nombre moyen d'images par seconde.
+    - restant : Nombre d'images restant à enregistrer sous cProfile (0 si aucune capture).
+    ------------------------------------------------------------------------------------------------
+    Chaque changement de phase ne coûte qu'un appel à time.perf_counter et une addition.
+    """
+
+    def __init__(self, lissage=0.1):
+        """
+        Initialise le profileur.
+        ------------------------------------------------------------------------------------------------
+        Paramètre :
+        - lissage : Poids de la dernière image dans les moyennes glissantes.
+        """
+        self.lissage = lissage
+        self.visible = False
+        self.moyennes = dict.fromkeys(PHASES, 0.0)
+        self.durees = dict.fromkeys(PHASES, 0.0)
+        self.ips = 0.0
+        self.phase = PHASES[0]
+        self.t = self.debut_image = time.perf_counter()
+        self.profil = None
+        self.restant = 0
+        self.police = None
+
+    def basculer(self, phase):
+        """Termine la phase en cours et commence la phase donnée."""
+        t = time.perf_counter()
+        self.durees[self.phase] += t - self.t
+        self.phase = phase
+        self.t = t
+
+    def fin_image(self):
+        """
+        Clôt l'image en cours : met à jour les moyennes et, si besoin, la capture cProfile.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - Le nom du fichier de statistiques écrit si une capture vient de se terminer, sinon None.
+        """
+        self.basculer(PHASES[0])
+        a = self.lissage
+        for phase, duree in self.durees.items():
+            self.moyennes[phase] += a * (1000 * duree - self.moyennes[phase])
+            self.durees[phase] = 0.0
+        duree_image = self.t - self.debut_image
+        self.debut_image = self.t
+        if duree_image > 0:
+            self.ips += a * (1 / duree_image - self.ips)
+
+        if self.restant:
+            self.restant -= 1
+            if self.restant == 0:
+                self.profil.disable()
+                fichier = time.strftime("profil_%Y%m%d_%H%M%S.prof")
+                self.profil.dump_stats(fichier)
+                pstats.Stats(self.profil).sort_stats("cumulative").print_stats(15)
+                self.profil = None
+                return fichier
+        return None
+
+    def capturer(self, nb_images=120):
+        """Enregistre les nb_images prochaines images sous cProfile (sans effet si une capture est en cours)."""
+        if self.restant:
+            return
+        self.profil = cProfile.Profile()
+        self.restant = nb_images
+        self.profil.enable()
+
+    def dessiner(self, fenetre, position):
+        """
+        Incruste les FPS et les millisecondes par phase à la position donnée.
+        ------------------------------------------------------------------------------------------------
+        Prend en entrée :
+        - fenetre : La surface Pygame où dessiner.
+        - position : Coin supérieur gauche (x, y) de l'incrustation.
+        """
+        if self.police is None:
+            self.police = pygame.font.Font(None, 24)
+        lignes = [f"{self.ips:6.1f} FPS"]
+        lignes += [f"{phase:<15}{self.moyennes[phase]:7.2f} ms" for phase in PHASES]
+        if self.restant:
+            lignes.append(f"cProfile : {self.restant} images")
+        x, y = position
+        fenetre.fill((0, 0, 0), (x, y, 220, 20 * (len(PHASES) + 2) + 10))
+        for i, ligne in enumerate(lignes):
+            fenetre.blit(self.police.render(ligne, True, (255, 255, 0)), (x + 8, y + 5 + 20 * i))
@@ -0,0 +1,157 @@
+import sys
+import time
+from array import array
+from collections import deque
+import numpy as np
+from class_graphe import HAUT, BAS, GAUCHE, DROITE, OPPOSE
+from analyse import murs_numpy, degres
+
+
+# en dessous de cette taille de couche, le coût fixe des opérations NumPy domine
+SEUIL_BLOC = 32
+
+
+def remplir_culs_de_sac(murs, depart, arrivee):
+    """
+    Comble en bloc, couche par couche, les culs-de-sac d'un labyrinthe.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - murs : Tableau uint8 de forme (h, l) des bits de passage (voir analyse.murs_numpy).
+    - depart, arrivee : Les sommets de départ et d'arrivée, qui ne sont jamais comblés.
+    ------------------------------------------------------------------------------------------------
+    À chaque itération, toutes les cases de degré au plus 1 (hors extrémités) sont comblées
+    d'un coup : leurs passages sont fermés et le degré de leurs voisins diminué. Seuls les
+    voisins des cases tout juste comblées peuvent devenir des culs-de-sac, si bien que chaque
+    itération ne travaille que sur la couche précédente et le coût total reste linéaire.
+    Les longs couloirs finissent en couches de quelques cases : passé SEUIL_BLOC, le reste
+    est comblé case par case (voir remplir_queue).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le masque booléen (h, l) des cases comblées.
+    - Les bits de passage (h, l) des cases restantes : le chemin pour un labyrinthe parfait,
+      le chemin et les boucles qui le croisent sinon.
+    """
+    h, l = murs.shape
+    ouverts = (murs.reshape(-1) & 15).copy()
+    deg = degres(ouverts).astype(np.int32)
+    rempli = np.zeros(h * l, dtype=bool)
+    garde = np.zeros(h * l, dtype=bool)
+    garde[[depart, arrivee]] = True
+
+    couche = np.flatnonzero((deg <= 1) & ~garde)
+    while couche.size >= SEUIL_BLOC:
+        rempli[couche] = True
+        voisins = []
+        for bit, decalage in ((HAUT, -l), (BAS, l), (GAUCHE, -1), (DROITE, 1)):
+            v = couche[(ouverts[couche] & bit) != 0] + decalage
+            ouverts[v] &= ~OPPOSE[bit] & 15
+            voisins.append(v)
+        ouverts[couche] = 0
+        voisins = np.concatenate(voisins)
+        # un voisin partagé par deux culs-de-sac perd deux passages
+        np.subtract.at(deg, voisins, 1)
+        voisins = np.unique(voisins)
+        couche = voisins[(deg[voisins] <= 1) & ~rempli[voisins] & ~garde[voisins]]
+    if couche.size:
+        ouverts, rempli = remplir_queue(ouverts, deg, rempli, couche.tolist(), l, (depart, arrivee))
+    return rempli.reshape(h, l), ouverts.reshape(h, l)
+
+
+def remplir_queue(ouverts, deg, rempli, pile, l, gardes):
+    """
+    Termine le remplissage case par case, à partir des culs-de-sac restants.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - ouverts, deg, rempli : Tableaux plats de remplir_culs_de_sac, dans leur état courant.
+    - pile : Liste des cases à combler.
+    - l : Largeur du labyrinthe.
+    - gardes : Les cases à ne jamais combler.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Les tableaux ouverts et rempli mis à jour.
+    """
+    o, d, r = bytearray(ouverts.tobytes()), deg.tolist(), bytearray(rempli.tobytes())
+    decalages = ((HAUT, -l), (BAS, l), (GAUCHE, -1), (DROITE, 1))
+    while pile:
+        s = pile.pop()
+        if r[s]:
+            continue
+        r[s] = 1
+        for bit, decalage in decalages:
+            if o[s] & bit:
+                v = s + decalage
+                o[v] &= ~OPPOSE[bit] & 15
+                d[v] -= 1
+                if d[v] <= 1 and not r[v] and v not in gardes:
+                    pile.append(v)
+        o[s] = 0
+    return np.frombuffer(o, dtype=np.uint8), np.frombuffer(r, dtype=bool)
+
+
+def chemin_restant(ouverts, depart, arrivee):
+    """
+    Extrait le plus court chemin parmi les cases restantes après remplissage.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - ouverts : Bits de passage (h, l) renvoyés par remplir_culs_de_sac.
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    ------------------------------------------------------------------------------------------------
+    Le parcours en largeur ne visite que les cases non comblées : pour un labyrinthe parfait,
+    ce sont exactement les cases du chemin.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - La liste des sommets de depart à arrivee, ou None si arrivee est inaccessible.
+    """
+    l = ouverts.shape[1]
+    plat = ouverts.tobytes()
+    decalages = ((HAUT, -l), (BAS, l), (GAUCHE, -1), (DROITE, 1))
+    precedent = array("i", [-1]) * len(plat)
+    precedent[depart] = depart
+    file = deque([depart])
+    while file:
+        s = file.popleft()
+        if s == arrivee:
+            chemin = [s]
+            while s != depart:
+                s = precedent[s]
+                chemin.append(s)
+            return chemin[::-1]
+        b = plat[s]
+        for bit, decalage in decalages:
+            if b & bit and precedent[s + decalage] < 0:
+                precedent[s + decalage] = s
+                file.append(s + decalage)
+    return None
+
+
+def remplissage(laby, depart, arrivee):
+    """
+    Résout le labyrinthe par remplissage des culs-de-sac.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe (GrapheGrille, ou tout graphe l x h possédant une méthode arc).
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le chemin (liste de sommets) de depart à arrivee, ou None s'il n'existe pas.
+    - Le masque booléen (h, l) des cases comblées.
+    """
+    rempli, ouverts = remplir_culs_de_sac(murs_numpy(laby), depart, arrivee)
+    return chemin_restant(ouverts, depart, arrivee), rempli
+
+
+def remplissage_chemin(laby, depart, arrivee):
+    """Renvoie uniquement le chemin trouvé par remplissage des culs-de-sac, ou None."""
+    return remplissage(laby, depart, arrivee)[0]
+
+
+if __name__ == "__main__":
+    from labyrinthe import generer_grille, generer_tresse
+    l, h = (int(x) for x in sys.argv[1:3]) if len(sys.argv) > 2 else (1000, 1000)
+    for nom, generateur in (("parfait", generer_grille), ("tressé", generer_tresse)):
+        laby = generateur(l, h)
+        t0 = time.perf_counter()
+        chemin, rempli = remplissage(laby, 0, l * h - 1)
+        duree = time.perf_counter() - t0
+        print(f"{nom} {l}x{h} : {rempli.sum()} cases comblées ({rempli.mean():.1%}), "
+              f"chemin de {len(chemin)} cases en {duree:.2f} s")
@@ -0,0 +1,140 @@
+import sys
+import time
+from array import array
+from collections import deque
+from random import randrange, seed
+from algorithmes import astar_etapes, heuristique
+
+
+def parcours_largeur(laby, source, arrets=None):
+    """
+    Calcule la distance (en nombre de pas) de chaque case du labyrinthe à une case source.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le graphe représentant le labyrinthe.
+    - source : Le sommet de départ du parcours.
+    - arrets : Ensemble optionnel de cases ; le parcours s'arrête dès qu'elles sont toutes
+      atteintes, les cases plus lointaines gardant alors la distance -1.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un tableau d'entiers (array 'i') de taille l*h, contenant -1 pour les cases inaccessibles.
+    """
+    n = laby.l * laby.h
+    dist = array('i', [-1]) * n
+    dist[source] = 0
+    restants = set(arrets) - {source} if arrets is not None else None
+    file = deque([source])
+    while file:
+        if restants is not None and not restants:
+            break
+        s = file.popleft()
+        if restants is not None:
+            restants.discard(s)
+        d = dist[s] + 1
+        for v in laby.voisins(s):
+            if dist[v] < 0:
+                dist[v] = d
+                file.append(v)
+    return dist
+
+
+class Reperes:
+    """
+    Prétraitement ALT (A*, Landmarks, Triangle inequality) d'un labyrinthe.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - sommets : Liste des k repères choisis.
+    - distances : Liste des k tableaux de distances (un par repère) vers toutes les cases.
+    ------------------------------------------------------------------------------------------------
+    Pour tout repère R, l'inégalité triangulaire donne d(a, b) >= |d(R, a) - d(R, b)| :
+    le maximum de ces bornes sur les repères est une heuristique admissible et cohérente,
+    bien plus serrée que la distance de Manhattan dans un labyrinthe.
+    """
+
+    def __init__(self, laby, k, depart=0):
+        """
+        Choisit k repères par la stratégie du point le plus éloigné et calcule leurs distances.
+        ------------------------------------------------------------------------------------------------
+        Paramètres :
+        - laby : Le graphe représentant le labyrinthe.
+        - k : Nombre de repères.
+        - depart : Case à partir de laquelle le premier repère est cherché (le plus éloigné d'elle).
+        """
+        self.sommets = []
+        self.distances = []
+        n = laby.l * laby.h
+        # plus petite distance de chaque case aux repères déjà choisis
+        proche = parcours_largeur(laby, depart)
+        for _ in range(k):
+            r = max(range(n), key=proche.__getitem__)
+            if proche[r] <= 0:
+                break
+            dist = parcours_largeur(laby, r)
+            self.sommets.append(r)
+            self.distances.append(dist)
+            if len(self.distances) == 1:
+                proche = array('i', dist)
+            else:
+                for s in range(n):
+                    if dist[s] < proche[s]:
+                        proche[s] = dist[s]
+
+    def heuristique(self, a, b, laby):
+        """
+        Minorant de la distance entre a et b, utilisable comme paramètre estimation de astar.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - Le maximum de la distance de Manhattan et des bornes |d(R, a) - d(R, b)| des repères.
+        """
+        h = heuristique(a, b, laby)
+        for dist in self.distances:
+            borne = abs(dist[a] - dist[b])
+            if borne > h:
+                h = borne
+        return h
+
+    def memoire(self):
+        """Retourne la mémoire occupée par les tableaux de distances, en octets."""
+        return sum(dist.itemsize * len(dist) for dist in self.distances)
+
+
+def rapport(laby, valeurs_k=(1, 2, 4, 8, 16), nb_requetes=50):
+    """
+    Mesure le compromis mémoire / vitesse des repères sur des requêtes répétées.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le graphe représentant le labyrinthe.
+    - valeurs_k : Nombres de repères à comparer.
+    - nb_requetes : Nombre de requêtes (départ, arrivée) aléatoires, identiques pour chaque k.
+    ------------------------------------------------------------------------------------------------
+    Pour k = 0 (distance de Manhattan seule) puis pour chaque k, mesure le temps de
+    prétraitement, la mémoire des tableaux de distances, le nombre moyen de cases
+    développées par astar et le temps moyen par requête.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères contenant le tableau des résultats.
+    """
+    n = laby.l * laby.h
+    requetes = [(randrange(n), randrange(n)) for _ in range(nb_requetes)]
+    lignes = ["{:>4} {:>14} {:>12} {:>14} {:>14}".format(
+        "k", "prétrait. (s)", "mémoire (Ko)", "cases dév.", "ms / requête")]
+    for k in (0,) + tuple(valeurs_k):
+        t0 = time.perf_counter()
+        estimation = Reperes(laby, k).heuristique if k else heuristique
+        memoire = estimation.__self__.memoire() if k else 0
+        t1 = time.perf_counter()
+        developpees = 0
+        for a, b in requetes:
+            _, etapes = astar_etapes(laby, a, b, estimation)
+            developpees += len(etapes)
+        t2 = time.perf_counter()
+        lignes.append("{:>4} {:>14.3f} {:>12.1f} {:>14.1f} {:>14.2f}".format(
+            k, t1 - t0, memoire / 1024, developpees / nb_requetes, 1000 * (t2 - t1) / nb_requetes))
+    return "\n".join(lignes)
+
+
+if __name__ == "__main__":
+    from labyrinthe import generer_tresse
+    l, h = (int(x) for x in (sys.argv[1:3] if len(sys.argv) >= 3 else (200, 200)))
+    seed(0)
+    print(rapport(generer_tresse(l, h, 0.3)))
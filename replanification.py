@@ -0,0 +1,194 @@
+import heapq
+import sys
+import time
+from random import randrange, seed
+from algorithmes import astar_etapes, heuristique
+from class_graphe import GrapheGrille, passages
+
+
+INFINI = float("inf")
+
+
+class LPAEtoile:
+    """
+    Plus court chemin incrémental (Lifelong Planning A*) entre deux cases fixes.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - laby : Le graphe représentant le labyrinthe, modifié par modifier_mur.
+    - grille : GrapheGrille sur lequel porte la recherche (laby lui-même, ou une copie de ses
+      passages tenue à jour, pour ne pas payer voisins en O(n) sur une matrice d'adjacence).
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    - g : Distances depuis depart établies par la dernière recherche.
+    - rhs : Distances prévues d'après les voisins (rhs[s] = 1 + min g[v] sur les voisins v).
+    - file : Tas des cases incohérentes (g != rhs), avec suppression paresseuse.
+    - cles : Dictionnaire case -> clé actuelle dans la file.
+    - developpes : Nombre de cases développées par la dernière mise à jour.
+    ------------------------------------------------------------------------------------------------
+    Les valeurs g et rhs sont conservées d'une modification à l'autre : ouvrir ou fermer un mur
+    ne rend incohérentes que ses deux cases, et la recherche suivante ne répare que la région
+    dont les distances changent vraiment, au lieu de tout recalculer.
+    """
+
+    def __init__(self, laby, depart, arrivee, estimation=heuristique):
+        """
+        Prépare la recherche (sans la lancer : voir chemin).
+        ------------------------------------------------------------------------------------------------
+        Paramètres :
+        - laby : Le graphe représentant le labyrinthe.
+        - depart, arrivee : Les sommets de départ et d'arrivée.
+        - estimation : Heuristique cohérente (a, b, laby), par défaut la distance de Manhattan.
+        """
+        self.laby = laby
+        self.grille = laby if isinstance(laby, GrapheGrille) else GrapheGrille(laby.l, laby.h, passages(laby))
+        self.depart = depart
+        self.arrivee = arrivee
+        self.estimation = estimation
+        self.g = [INFINI] * self.grille.n
+        self.rhs = [INFINI] * self.grille.n
+        self.rhs[depart] = 0
+        self.file = []
+        self.cles = {}
+        self.developpes = 0
+        self.inserer(depart)
+
+    def cle(self, s):
+        """Retourne la clé de priorité de la case s."""
+        m = min(self.g[s], self.rhs[s])
+        return (m + self.estimation(s, self.arrivee, self.laby), m)
+
+    def inserer(self, s):
+        """Place la case s dans la file avec sa clé actuelle."""
+        cle = self.cle(s)
+        self.cles[s] = cle
+        heapq.heappush(self.file, (cle, s))
+
+    def tete(self):
+        """Retourne la plus petite clé valide de la file (en éliminant les entrées périmées)."""
+        while self.file:
+            cle, s = self.file[0]
+            if self.cles.get(s) == cle:
+                return cle
+            heapq.heappop(self.file)
+        return (INFINI, INFINI)
+
+    def mettre_a_jour(self, s):
+        """Recalcule rhs[s] d'après ses voisins et replace s dans la file s'il est incohérent."""
+        if s != self.depart:
+            self.rhs[s] = min((self.g[v] for v in self.grille.voisins(s)), default=INFINI) + 1
+        self.cles.pop(s, None)
+        if self.g[s] != self.rhs[s]:
+            self.inserer(s)
+
+    def calculer(self):
+        """Répare les distances jusqu'à ce que celle de arrivee soit établie."""
+        self.developpes = 0
+        while (self.tete() < self.cle(self.arrivee)
+               or self.rhs[self.arrivee] != self.g[self.arrivee]):
+            if not self.file:
+                break
+            _, s = heapq.heappop(self.file)
+            del self.cles[s]
+            self.developpes += 1
+            if self.g[s] > self.rhs[s]:
+                self.g[s] = self.rhs[s]
+                for v in self.grille.voisins(s):
+                    self.mettre_a_jour(v)
+            else:
+                self.g[s] = INFINI
+                self.mettre_a_jour(s)
+                for v in self.grille.voisins(s):
+                    self.mettre_a_jour(v)
+
+    def chemin(self):
+        """
+        Met à jour la recherche et renvoie le plus court chemin.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - La liste des sommets de depart à arrivee, ou None si arrivee est inaccessible.
+        """
+        self.calculer()
+        if self.g[self.arrivee] == INFINI:
+            return None
+        s = self.arrivee
+        chemin = [s]
+        while s != self.depart:
+            s = min(self.grille.voisins(s), key=self.g.__getitem__)
+            chemin.append(s)
+        return chemin[::-1]
+
+    def modifier_mur(self, s1, s2, ouvert):
+        """
+        Ouvre ou ferme le passage entre deux cases adjacentes et signale le changement.
+        ------------------------------------------------------------------------------------------------
+        Prend en entrée :
+        - s1, s2 : Deux cases adjacentes.
+        - ouvert : Booléen, True pour ouvrir le passage, False pour le fermer.
+        ------------------------------------------------------------------------------------------------
+        Le graphe est modifié avec ajouter_arc / supprimer_arc ; le prochain appel à chemin
+        répare la recherche.
+        """
+        for graphe in {id(self.laby): self.laby, id(self.grille): self.grille}.values():
+            if ouvert:
+                graphe.ajouter_arc(s1, s2)
+            else:
+                graphe.supprimer_arc(s1, s2)
+        self.mettre_a_jour(s1)
+        self.mettre_a_jour(s2)
+
+    def basculer_mur(self, s1, s2):
+        """Ouvre le passage entre s1 et s2 s'il est fermé, le ferme sinon."""
+        self.modifier_mur(s1, s2, not self.grille.arc(s1, s2))
+
+
+def comparer(l, h, nb_modifications, graine=0):
+    """
+    Compare la replanification incrémentale à une recherche A* complète après chaque modification.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - l, h : Dimensions du labyrinthe (tressé à 30 %, pour que des détours existent).
+    - nb_modifications : Nombre de murs basculés au hasard.
+    - graine : Graine du générateur aléatoire.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères résumant temps et cases développées des deux méthodes.
+    """
+    from labyrinthe import generer_tresse
+    seed(graine)
+    grille = generer_tresse(l, h, 0.3)
+    depart, arrivee = 0, l * h - 1
+    lpa = LPAEtoile(grille, depart, arrivee)
+    t0 = time.perf_counter()
+    lpa.chemin()
+    initial = time.perf_counter() - t0
+    temps = {"LPA*": 0.0, "A*": 0.0}
+    developpes = {"LPA*": 0, "A*": 0}
+    for _ in range(nb_modifications):
+        s1 = randrange(l * h)
+        if s1 % l < l - 1 and (randrange(2) or s1 + l >= l * h):
+            s2 = s1 + 1
+        elif s1 + l < l * h:
+            s2 = s1 + l
+        else:
+            continue
+        t0 = time.perf_counter()
+        lpa.basculer_mur(s1, s2)
+        chemin = lpa.chemin()
+        temps["LPA*"] += time.perf_counter() - t0
+        developpes["LPA*"] += lpa.developpes
+        t0 = time.perf_counter()
+        reference, etapes = astar_etapes(grille, depart, arrivee)
+        temps["A*"] += time.perf_counter() - t0
+        developpes["A*"] += len(etapes)
+        assert (chemin is None) == (reference is None)
+        assert chemin is None or len(chemin) == len(reference), 'Chemin incrémental non optimal'
+    lignes = [f"Labyrinthe {l}x{h}, recherche initiale : {1000 * initial:.1f} ms"]
+    for methode in temps:
+        lignes.append(f"{methode:5} : {1000 * temps[methode] / nb_modifications:8.2f} ms et "
+                      f"{developpes[methode] / nb_modifications:9.1f} cases développées par modification")
+    return "\n".join(lignes)
+
+
+if __name__ == "__main__":
+    l, h = (int(x) for x in sys.argv[1:3]) if len(sys.argv) > 2 else (300, 300)
+    nb = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    print(comparer(l, h, nb))
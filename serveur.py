@@ -0,0 +1,485 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from class_graphe import ENTETE_GRILLE, charger_grille, sauver_grille
+from reperes import parcours_largeur
+from tournoi import charger
+
+
+SOLVEURS = {
+    "dijkstra": ("algorithmes", "dijkstra"),
+    "astar": ("algorithmes", "astar"),
+    "remplissage": ("remplissage", "remplissage_chemin"),
+    "tremaux": ("solveurs_memoire", "tremaux_chemin"),
+}
+NOM_VALIDE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+MAX_CASES = 16_000_000
+RAISONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class ErreurRequete(Exception):
+    """Erreur à renvoyer au client avec le code HTTP donné."""
+
+    def __init__(self, statut, message):
+        """Initialise l'erreur avec son code HTTP et son message."""
+        super().__init__(message)
+        self.statut = statut
+
+
+# ------------------------------------------------------------------------------------------------
+# Côté processus de calcul
+# ------------------------------------------------------------------------------------------------
+
+_residents = {} # fichier -> (date de modification, labyrinthe projeté en mémoire)
+
+
+def labyrinthe_resident(fichier):
+    """
+    Renvoie le labyrinthe stocké dans fichier, chargé une seule fois par processus de calcul.
+    ------------------------------------------------------------------------------------------------
+    Le fichier est projeté en mémoire (voir charger_grille) : les pages sont partagées entre les
+    processus par le cache du système. Il est rechargé s'il a été régénéré depuis.
+    """
+    date = os.stat(fichier).st_mtime_ns
+    if fichier not in _residents or _residents[fichier][0] != date:
+        _residents[fichier] = (date, charger_grille(fichier))
+    return _residents[fichier][1]
+
+
+def chemin_par_distances(laby, dist, arrivee):
+    """Remonte de arrivee vers la source d'un parcours en largeur (distances dist) et renvoie le chemin."""
+    if dist[arrivee] < 0:
+        return None
+    chemin = [arrivee]
+    s = arrivee
+    while dist[s]:
+        s = next(v for v in laby.voisins(s) if dist[v] == dist[s] - 1)
+        chemin.append(s)
+    return chemin[::-1]
+
+
+def resoudre_lot(fichier, solveur, paires):
+    """
+    Résout un lot de requêtes sur un même labyrinthe (exécuté dans un processus de calcul).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - fichier : Fichier de grille du labyrinthe.
+    - solveur : Nom du solveur (clé de SOLVEURS).
+    - paires : Liste de couples (depart, arrivee).
+    ------------------------------------------------------------------------------------------------
+    Les paires identiques ne sont résolues qu'une fois. Pour dijkstra, toutes les paires de même
+    départ partagent un seul parcours en largeur (les arcs sont de poids 1), arrêté dès que
+    toutes leurs arrivées sont atteintes, dont on remonte ensuite le chemin de chaque arrivée.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - La liste des chemins (ou None), dans l'ordre des paires.
+    """
+    laby = labyrinthe_resident(fichier)
+    chemins = {}
+    if solveur == "dijkstra":
+        par_depart = {}
+        for depart, arrivee in paires:
+            par_depart.setdefault(depart, set()).add(arrivee)
+        for depart, arrivees in par_depart.items():
+            dist = parcours_largeur(laby, depart, arrivees)
+            for arrivee in arrivees:
+                chemins[depart, arrivee] = chemin_par_distances(laby, dist, arrivee)
+    else:
+        resoudre = charger(SOLVEURS[solveur])
+        for paire in set(paires):
+            chemins[paire] = resoudre(laby, *paire)
+    return [chemins[paire] for paire in paires]
+
+
+def generer(fichier, l, h, tressage, graine):
+    """Génère un labyrinthe (éventuellement tressé) et l'écrit dans fichier (processus de calcul)."""
+    from labyrinthe import generer_grille, tresser
+    random.seed(graine)
+    g = generer_grille(l, h)
+    if tressage:
+        tresser(g, tressage)
+    sauver_grille(g, fichier)
+    return {"l": l, "h": h}
+
+
+# ------------------------------------------------------------------------------------------------
+# Côté serveur
+# ------------------------------------------------------------------------------------------------
+
+class Regroupeur:
+    """
+    Regroupe en lots les requêtes de résolution concurrentes portant sur un même labyrinthe.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - pool : Le pool de processus de calcul.
+    - paralleles : Nombre maximal de lots simultanés par labyrinthe et par solveur.
+    - actif : Booléen ; s'il est faux, chaque requête part seule (pour comparaison).
+    - en_attente : Dictionnaire (fichier, solveur) -> liste de (depart, arrivee, futur).
+    - en_cours : Dictionnaire (fichier, solveur) -> nombre de lots en cours de calcul.
+    - nb_requetes, nb_lots : Compteurs pour les statistiques.
+    ------------------------------------------------------------------------------------------------
+    Une requête part immédiatement si un lot est disponible ; sinon elle attend la fin d'un lot
+    et repart avec toutes celles arrivées entre-temps. Aucune latence n'est donc ajoutée au
+    repos, et sous charge un seul aller-retour vers un processus sert de nombreuses requêtes.
+    """
+
+    def __init__(self, pool, paralleles, actif=True):
+        """Initialise un regroupeur sans requête en attente."""
+        self.pool = pool
+        self.paralleles = paralleles
+        self.actif = actif
+        self.en_attente = {}
+        self.en_cours = {}
+        self.nb_requetes = 0
+        self.nb_lots = 0
+
+    async def resoudre(self, fichier, solveur, depart, arrivee):
+        """Soumet une requête et renvoie son chemin une fois son lot calculé."""
+        self.nb_requetes += 1
+        if not self.actif:
+            self.nb_lots += 1
+            chemins = await asyncio.get_running_loop().run_in_executor(
+                self.pool, resoudre_lot, fichier, solveur, [(depart, arrivee)])
+            return chemins[0]
+        cle = (fichier, solveur)
+        futur = asyncio.get_running_loop().create_future()
+        self.en_attente.setdefault(cle, []).append((depart, arrivee, futur))
+        if self.en_cours.get(cle, 0) < self.paralleles:
+            self.en_cours[cle] = self.en_cours.get(cle, 0) + 1
+            asyncio.create_task(self.vider(cle))
+        return await futur
+
+    async def vider(self, cle):
+        """Envoie les lots en attente pour cle tant qu'il y en a."""
+        try:
+            while self.en_attente.get(cle):
+                lot = self.en_attente.pop(cle)
+                self.nb_lots += 1
+                try:
+                    chemins = await asyncio.get_running_loop().run_in_executor(
+                        self.pool, resoudre_lot, *cle, [(d, a) for d, a, _ in lot])
+                except Exception as erreur:
+                    for _, _, futur in lot:
+                        if not futur.done():
+                            futur.set_exception(erreur)
+                else:
+                    for (_, _, futur), chemin in zip(lot, chemins):
+                        if not futur.done():
+                            futur.set_result(chemin)
+        finally:
+            self.en_cours[cle] -= 1
+
+
+class Serveur:
+    """
+    Service HTTP/JSON de génération et de résolution de labyrinthes stockés dans un dossier.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - dossier : Dossier des fichiers de grille (un fichier nom.grille par labyrinthe).
+    - processus : Nombre de processus de calcul.
+    - pool : Pool de processus exécutant générations et résolutions (recréé s'il est cassé).
+    - regroupeur : Le Regroupeur des requêtes de résolution.
+    - dimensions : Dictionnaire nom -> (l, h) des labyrinthes connus.
+    - connexions : Dictionnaire des connexions ouvertes (tâche -> flux d'écriture).
+    ------------------------------------------------------------------------------------------------
+    Points d'accès (corps et réponses en JSON) :
+    - GET /labyrinthes : liste des labyrinthes et de leurs dimensions.
+    - POST /generer {nom, l, h, tressage?, graine?} : génère et enregistre un labyrinthe.
+    - POST /resoudre {nom, depart?, arrivee?, solveur?, chemin?} : résout une requête.
+    - POST /resoudre_lot {nom, paires, solveur?, chemin?} : résout une liste de [depart, arrivee].
+    - GET /stats : nombre de requêtes et taille moyenne des lots.
+    """
+
+    def __init__(self, dossier="labyrinthes", processus=None, regrouper=True):
+        """Crée le dossier si besoin, relève les labyrinthes existants et lance le pool."""
+        self.dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+        self.processus = processus or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.processus)
+        self.regroupeur = Regroupeur(self.pool, self.processus, regrouper)
+        self.dimensions = {}
+        self.connexions = {}
+        for nom_fichier in os.listdir(dossier):
+            nom, extension = os.path.splitext(nom_fichier)
+            if extension == ".grille":
+                with open(os.path.join(dossier, nom_fichier), "rb") as f:
+                    _, l, h = ENTETE_GRILLE.unpack(f.read(ENTETE_GRILLE.size))
+                self.dimensions[nom] = (l, h)
+
+    def reparer_pool(self):
+        """
+        Remplace le pool de processus s'il est cassé (processus de calcul mort brutalement).
+        Sans cela, toutes les requêtes suivantes échoueraient jusqu'au redémarrage du serveur.
+        """
+        try:
+            self.pool.submit(int)
+        except BrokenProcessPool:
+            self.pool.shutdown(wait=False)
+            self.pool = ProcessPoolExecutor(self.processus)
+            self.regroupeur.pool = self.pool
+
+    def fichier(self, nom):
+        """Retourne le fichier du labyrinthe nom, qui doit exister."""
+        if nom not in self.dimensions:
+            raise ErreurRequete(404, f"labyrinthe inconnu : {nom}")
+        return os.path.join(self.dossier, nom + ".grille")
+
+    def paire(self, nom, depart, arrivee):
+        """Vérifie qu'un couple (depart, arrivee) désigne des cases du labyrinthe nom."""
+        l, h = self.dimensions[nom]
+        depart = 0 if depart is None else int(depart)
+        arrivee = l * h - 1 if arrivee is None else int(arrivee)
+        if not (0 <= depart < l * h and 0 <= arrivee < l * h):
+            raise ErreurRequete(400, f"cases hors du labyrinthe {l}x{h}")
+        return depart, arrivee
+
+    @staticmethod
+    def reponse_chemin(depart, arrivee, chemin, avec_chemin):
+        """Met en forme le résultat d'une résolution."""
+        reponse = {"depart": depart, "arrivee": arrivee, "longueur": len(chemin) - 1 if chemin else None}
+        if avec_chemin:
+            reponse["chemin"] = chemin
+        return reponse
+
+    async def traiter(self, methode, cible, corps):
+        """
+        Exécute une requête HTTP.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - Le code HTTP et l'objet JSON de la réponse.
+        """
+        if cible == "/labyrinthes" and methode == "GET":
+            return 200, {nom: {"l": l, "h": h} for nom, (l, h) in sorted(self.dimensions.items())}
+        if cible == "/stats" and methode == "GET":
+            r = self.regroupeur
+            return 200, {"requetes": r.nb_requetes, "lots": r.nb_lots,
+                         "taille_moyenne_lot": r.nb_requetes / r.nb_lots if r.nb_lots else 0}
+        if cible not in ("/generer", "/resoudre", "/resoudre_lot"):
+            raise ErreurRequete(404, f"point d'accès inconnu : {cible}")
+        if methode != "POST":
+            raise ErreurRequete(405, f"{cible} attend une requête POST")
+        donnees = json.loads(corps or b"{}")
+        nom = donnees["nom"]
+        boucle = asyncio.get_running_loop()
+
+        if cible == "/generer":
+            if not NOM_VALIDE.match(nom):
+                raise ErreurRequete(400, f"nom invalide : {nom}")
+            l, h = int(donnees["l"]), int(donnees["h"])
+            if not (0 < l and 0 < h and l * h <= MAX_CASES):
+                raise ErreurRequete(400, f"taille refusée : {l}x{h} (au plus {MAX_CASES} cases)")
+            fichier = os.path.join(self.dossier, nom + ".grille")
+            reponse = await boucle.run_in_executor(self.pool, generer, fichier, l, h,
+                                                   float(donnees.get("tressage", 0)), donnees.get("graine"))
+            self.dimensions[nom] = (l, h)
+            return 200, dict(reponse, nom=nom)
+
+        fichier = self.fichier(nom)
+        solveur = donnees.get("solveur", "dijkstra")
+        if solveur not in SOLVEURS:
+            raise ErreurRequete(400, f"solveur inconnu : {solveur}")
+        avec_chemin = donnees.get("chemin", True)
+        if cible == "/resoudre":
+            depart, arrivee = self.paire(nom, donnees.get("depart"), donnees.get("arrivee"))
+            chemin = await self.regroupeur.resoudre(fichier, solveur, depart, arrivee)
+            return 200, self.reponse_chemin(depart, arrivee, chemin, avec_chemin)
+
+        paires = [self.paire(nom, d, a) for d, a in donnees["paires"]]
+        chemins = await boucle.run_in_executor(self.pool, resoudre_lot, fichier, solveur, paires)
+        return 200, {"resultats": [self.reponse_chemin(d, a, chemin, avec_chemin)
+                                   for (d, a), chemin in zip(paires, chemins)]}
+
+    async def client(self, lecteur, ecrivain):
+        """Sert les requêtes HTTP/1.1 d'une connexion (maintenue ouverte entre les requêtes)."""
+        tache = asyncio.current_task()
+        self.connexions[tache] = ecrivain
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                methode, cible, _ = ligne.decode("latin-1").split()
+                entetes = {}
+                while True:
+                    ligne = await lecteur.readline()
+                    if ligne in (b"\r\n", b"\n", b""):
+                        break
+                    cle, _, valeur = ligne.decode("latin-1").partition(":")
+                    entetes[cle.strip().lower()] = valeur.strip()
+                corps = await lecteur.readexactly(int(entetes.get("content-length", 0)))
+                try:
+                    statut, reponse = await self.traiter(methode, cible, corps)
+                except ErreurRequete as erreur:
+                    statut, reponse = erreur.statut, {"erreur": str(erreur)}
+                except (KeyError, ValueError, TypeError) as erreur:
+                    statut, reponse = 400, {"erreur": f"requête invalide : {erreur!r}"}
+                except BrokenProcessPool as erreur:
+                    self.reparer_pool()
+                    statut, reponse = 500, {"erreur": repr(erreur)}
+                except Exception as erreur:
+                    statut, reponse = 500, {"erreur": repr(erreur)}
+                donnees = json.dumps(reponse).encode("utf-8")
+                ecrivain.write(f"HTTP/1.1 {statut} {RAISONS[statut]}\r\n"
+                               f"Content-Type: application/json\r\n"
+                               f"Content-Length: {len(donnees)}\r\n\r\n".encode("latin-1") + donnees)
+                await ecrivain.drain()
+                if entetes.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass # connexion fermée ou ligne de requête illisible
+        finally:
+            del self.connexions[tache]
+            ecrivain.close()
+
+    async def demarrer(self, hote="127.0.0.1", port=8765):
+        """Ouvre le port d'écoute et renvoie le serveur asyncio."""
+        return await asyncio.start_server(self.client, hote, port)
+
+    async def arreter(self, ecoute):
+        """Ferme le port d'écoute et les connexions ouvertes, puis arrête le pool de processus."""
+        ecoute.close()
+        for ecrivain in self.connexions.values():
+            ecrivain.close()
+        await asyncio.gather(*self.connexions, return_exceptions=True)
+        await ecoute.wait_closed()
+        self.pool.shutdown()
+
+
+# ------------------------------------------------------------------------------------------------
+# Test de charge
+# ------------------------------------------------------------------------------------------------
+
+async def requete(lecteur, ecrivain, methode, cible, corps=None):
+    """Envoie une requête HTTP sur une connexion ouverte et renvoie (code, objet JSON)."""
+    donnees = json.dumps(corps).encode("utf-8") if corps is not None else b""
+    ecrivain.write(f"{methode} {cible} HTTP/1.1\r\nHost: localhost\r\n"
+                   f"Content-Length: {len(donnees)}\r\n\r\n".encode("latin-1") + donnees)
+    await ecrivain.drain()
+    statut = int((await lecteur.readline()).split()[1])
+    longueur = 0
+    while True:
+        ligne = await lecteur.readline()
+        if ligne in (b"\r\n", b""):
+            break
+        cle, _, valeur = ligne.decode("latin-1").partition(":")
+        if cle.lower() == "content-length":
+            longueur = int(valeur)
+    return statut, json.loads(await lecteur.readexactly(longueur))
+
+
+def percentile(valeurs, p):
+    """Retourne le percentile p (entre 0 et 100) d'une liste triée."""
+    return valeurs[min(len(valeurs) - 1, int(p / 100 * len(valeurs)))]
+
+
+async def charge(hote, port, nom, nb_requetes, nb_clients, solveur, nb_paires, nb_departs):
+    """
+    Envoie nb_requetes requêtes /resoudre réparties sur nb_clients connexions simultanées.
+    ------------------------------------------------------------------------------------------------
+    Les requêtes sont tirées parmi nb_paires couples (depart, arrivee) n'utilisant que nb_departs
+    cases de départ, comme des visiteurs partant de quelques entrées : des requêtes concurrentes
+    peuvent alors partager un parcours.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un dictionnaire : latences p50 et p99 (ms), débit (requêtes/s), erreurs.
+    """
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    _, labyrinthes = await requete(lecteur, ecrivain, "GET", "/labyrinthes")
+    ecrivain.close()
+    await ecrivain.wait_closed()
+    n = labyrinthes[nom]["l"] * labyrinthes[nom]["h"]
+    departs = [random.randrange(n) for _ in range(nb_departs)]
+    paires = [(random.choice(departs), random.randrange(n)) for _ in range(nb_paires)]
+    latences = []
+    erreurs = 0
+    restantes = [nb_requetes]
+
+    async def client():
+        nonlocal erreurs
+        lecteur, ecrivain = await asyncio.open_connection(hote, port)
+        while restantes[0] > 0:
+            restantes[0] -= 1
+            depart, arrivee = random.choice(paires)
+            t0 = time.perf_counter()
+            statut, _ = await requete(lecteur, ecrivain, "POST", "/resoudre",
+                                      {"nom": nom, "depart": depart, "arrivee": arrivee,
+                                       "solveur": solveur, "chemin": False})
+            latences.append(1000 * (time.perf_counter() - t0))
+            erreurs += statut != 200
+        ecrivain.close()
+        await ecrivain.wait_closed()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(nb_clients)))
+    duree = time.perf_counter() - t0
+    latences.sort()
+    return {"p50_ms": percentile(latences, 50), "p99_ms": percentile(latences, 99),
+            "moyenne_ms": statistics.fmean(latences), "debit": len(latences) / duree, "erreurs": erreurs}
+
+
+async def test_de_charge(args):
+    """Lance un serveur local (avec puis sans regroupement) et mesure ses performances."""
+    for regrouper in (True, False):
+        serveur = Serveur(args.dossier, args.processus, regrouper)
+        ecoute = await serveur.demarrer(args.hote, args.port)
+        try:
+            lecteur, ecrivain = await asyncio.open_connection(args.hote, args.port)
+            if regrouper:
+                statut, reponse = await requete(lecteur, ecrivain, "POST", "/generer",
+                                                {"nom": "charge", "l": args.taille, "h": args.taille,
+                                                 "graine": 0})
+                assert statut == 200, reponse
+            await requete(lecteur, ecrivain, "POST", "/resoudre", {"nom": "charge", "chemin": False})
+            resultats = await charge(args.hote, args.port, "charge", args.requetes, args.clients,
+                                     args.solveur, args.paires, args.departs)
+            _, stats = await requete(lecteur, ecrivain, "GET", "/stats")
+            ecrivain.close()
+            await ecrivain.wait_closed()
+        finally:
+            await serveur.arreter(ecoute)
+        print(f"{'avec' if regrouper else 'sans'} regroupement : "
+              f"p50 {resultats['p50_ms']:.1f} ms, p99 {resultats['p99_ms']:.1f} ms, "
+              f"{resultats['debit']:.0f} requêtes/s, {resultats['erreurs']} erreurs, "
+              f"{stats['taille_moyenne_lot']:.1f} requêtes par lot")
+
+
+async def servir(args):
+    """Lance le serveur jusqu'à interruption."""
+    serveur = Serveur(args.dossier, args.processus, not args.sans_regroupement)
+    ecoute = await serveur.demarrer(args.hote, args.port)
+    print(f"Service sur http://{args.hote}:{args.port} ({len(serveur.dimensions)} labyrinthes dans {args.dossier})")
+    try:
+        await ecoute.serve_forever()
+    finally:
+        await serveur.arreter(ecoute)
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Service HTTP/JSON local de labyrinthes.")
+    parseur.add_argument("--hote", default="127.0.0.1")
+    parseur.add_argument("--port", type=int, default=8765)
+    parseur.add_argument("--dossier", default="labyrinthes")
+    parseur.add_argument("--processus", type=int, default=None)
+    commandes = parseur.add_subparsers(dest="commande", required=True)
+    serv = commandes.add_parser("servir", help="lance le service")
+    serv.add_argument("--sans-regroupement", action="store_true")
+    test = commandes.add_parser("charge", help="test de charge sur un serveur local temporaire")
+    test.add_argument("--taille", type=int, default=200)
+    test.add_argument("--requetes", type=int, default=1000)
+    test.add_argument("--clients", type=int, default=64)
+    test.add_argument("--paires", type=int, default=50)
+    test.add_argument("--departs", type=int, default=4)
+    test.add_argument("--solveur", choices=list(SOLVEURS), default="dijkstra")
+    args = parseur.parse_args()
+    try:
+        asyncio.run(servir(args) if args.commande == "servir" else test_de_charge(args))
+    except KeyboardInterrupt:
+        pass
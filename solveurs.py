@@ -0,0 +1,58 @@
+from algorithmes import astar
+from reperes import Reperes
+from hpa import Hierarchie
+from replanification import LPAEtoile
+
+
+# Solveurs comparables par le tournoi : nom -> (module, fonction (laby, depart, arrivee) -> chemin).
+# Les modules des solveurs sont importés à l'usage (voir tournoi.charger) ; ce module et ceux
+# qu'il importe ne dépendent pas de pygame, pour que les processus du tournoi n'aient pas à
+# charger l'interface graphique.
+SOLVEURS = {
+    "dijkstra": ("algorithmes", "dijkstra"),
+    "astar": ("algorithmes", "astar"),
+    "trouver_chemin": ("algorithmes", "trouver_chemin"),
+    "alt": ("solveurs", "alt"),
+    "hpa": ("solveurs", "hpa"),
+    "lpa": ("solveurs", "lpa"),
+    "mur": ("solveurs_memoire", "suivre_mur_simplifie"),
+    "pledge": ("solveurs_memoire", "pledge_simplifie"),
+    "tremaux": ("solveurs_memoire", "tremaux_chemin"),
+    "remplissage": ("remplissage", "remplissage_chemin"),
+}
+# Prétraitements mesurés à part : nom -> (module, fonction laby -> solveur (laby, depart, arrivee))
+PRETRAITEMENTS = {
+    "alt": ("solveurs", "preparer_alt"),
+    "hpa": ("solveurs", "preparer_hpa"),
+}
+# Solveurs qui lisent directement les passages sans appeler voisins : pas de sommets développés
+SANS_VOISINS = {"mur", "pledge", "tremaux", "remplissage"}
+NB_REPERES = 8
+TAILLE_BLOCS = 16
+
+
+def preparer_alt(laby):
+    """Choisit NB_REPERES repères et renvoie le solveur A* guidé par eux (ALT)."""
+    estimation = Reperes(laby, NB_REPERES).heuristique
+    return lambda laby, depart, arrivee: astar(laby, depart, arrivee, estimation)
+
+
+def preparer_hpa(laby):
+    """Construit la hiérarchie HPA* (blocs de TAILLE_BLOCS cases) et renvoie le solveur associé."""
+    hierarchie = Hierarchie(laby, TAILLE_BLOCS)
+    return lambda laby, depart, arrivee: hierarchie.chercher(depart, arrivee)[0]
+
+
+def alt(laby, depart, arrivee):
+    """Renvoie le chemin trouvé par ALT, prétraitement compris."""
+    return preparer_alt(laby)(laby, depart, arrivee)
+
+
+def hpa(laby, depart, arrivee):
+    """Renvoie le chemin trouvé par HPA*, prétraitement compris."""
+    return preparer_hpa(laby)(laby, depart, arrivee)
+
+
+def lpa(laby, depart, arrivee):
+    """Renvoie le chemin trouvé par une première recherche LPA* (sans modification de mur)."""
+    return LPAEtoile(laby, depart, arrivee).chemin()
@@ -0,0 +1,323 @@
+import argparse
+import sys
+from class_graphe import GrapheGrille, HAUT, BAS, GAUCHE, DROITE, charger_grille, sauver_grille
+
+
+# Directions dans le sens des aiguilles d'une montre : tourner à droite revient à ajouter 1
+SENS_HORAIRE = (HAUT, DROITE, BAS, GAUCHE)
+
+
+def lecteur_passages(laby):
+    """
+    Renvoie une fonction donnant les bits de passage d'une case, sans allocation par appel.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe (GrapheGrille, éventuellement projeté en mémoire, ou graphe possédant arc).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une fonction s -> octet de bits HAUT/BAS/GAUCHE/DROITE ouverts.
+    """
+    if isinstance(laby, GrapheGrille):
+        return laby.murs.__getitem__
+    l, n = laby.l, laby.l * laby.h
+
+    def passages(s):
+        b = 0
+        if s >= l and laby.arc(s, s - l):
+            b |= HAUT
+        if s < n - l and laby.arc(s, s + l):
+            b |= BAS
+        if s % l > 0 and laby.arc(s, s - 1):
+            b |= GAUCHE
+        if s % l < l - 1 and laby.arc(s, s + 1):
+            b |= DROITE
+        return b
+    return passages
+
+
+def suivre_mur(laby, depart, arrivee, main_droite=True):
+    """
+    Parcourt le labyrinthe en gardant une main contre le mur (mémoire constante).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe.
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    - main_droite : Booléen indiquant la main posée sur le mur (droite ou gauche).
+    ------------------------------------------------------------------------------------------------
+    Seuls la case courante et le sens de marche sont mémorisés. La méthode est complète pour
+    les labyrinthes parfaits ; dans un labyrinthe à boucles, elle peut tourner autour d'un îlot,
+    ce qui est détecté par le retour à l'état initial.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un générateur des cases visitées, de depart jusqu'à arrivee (la marche s'arrête avant
+      arrivee si celle-ci est inaccessible).
+    """
+    passages = lecteur_passages(laby)
+    l = laby.l
+    decalages = (-l, 1, l, -1)
+    essais = (1, 0, 3, 2) if main_droite else (3, 0, 1, 2)
+    s, d = depart, 2
+    yield s
+    etat_initial = None
+    while s != arrivee:
+        ouverts = passages(s)
+        if not ouverts:
+            return
+        for t in essais:
+            if ouverts & SENS_HORAIRE[(d + t) % 4]:
+                d = (d + t) % 4
+                break
+        if etat_initial is None:
+            etat_initial = (s, d)
+        elif (s, d) == etat_initial:
+            return
+        s += decalages[d]
+        yield s
+
+
+def pledge(laby, depart, arrivee, direction=None, main_droite=True):
+    """
+    Parcourt le labyrinthe par l'algorithme de Pledge (mémoire constante).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe.
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    - direction : Direction privilégiée (HAUT, BAS, GAUCHE ou DROITE) ; par défaut, celle qui
+      rapproche le plus de arrivee.
+    - main_droite : Booléen indiquant la main posée sur le mur quand on longe un obstacle.
+    ------------------------------------------------------------------------------------------------
+    On avance dans la direction privilégiée ; face à un mur, on le longe en comptant les quarts
+    de tour (+1 à droite, -1 à gauche), et on ne le quitte que lorsque ce compte revient à 0.
+    Contrairement au suivi de mur simple, la marche ne tourne pas indéfiniment autour d'un îlot.
+    Seuls la case, le sens de marche, le compte et un état de référence pour détecter les cycles
+    (méthode de Brent) sont mémorisés. Pledge garantit de sortir d'un obstacle, pas d'atteindre
+    une case intérieure : la marche s'arrête si elle boucle.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un générateur des cases visitées, de depart jusqu'à arrivee (la marche s'arrête avant
+      arrivee si celle-ci n'est pas atteinte).
+    """
+    passages = lecteur_passages(laby)
+    l = laby.l
+    decalages = (-l, 1, l, -1)
+    if direction is None:
+        di, dj = arrivee // l - depart // l, arrivee % l - depart % l
+        direction = (BAS if di >= 0 else HAUT) if abs(di) > abs(dj) else (DROITE if dj >= 0 else GAUCHE)
+    prefere = SENS_HORAIRE.index(direction)
+    # Essais (t, quarts de tour) : t est relatif au sens de marche (0 : tout droit, 1 : droite,
+    # 2 : demi-tour, 3 : gauche). Face à un mur, on tourne du côté opposé à la main posée.
+    if main_droite:
+        libre = ((0, 0), (3, -1), (2, -2), (1, -3))
+        longer = ((1, 1), (0, 0), (3, -1), (2, -2))
+    else:
+        libre = ((0, 0), (1, 1), (2, 2), (3, 3))
+        longer = ((3, -1), (0, 0), (1, 1), (2, 2))
+    limite = 4 * laby.l * laby.h + 4 # au-delà, le compte ne peut plus revenir à 0
+    s, d, compte = depart, prefere, 0
+    reference, puissance, longueur = None, 1, 0
+    yield s
+    while s != arrivee:
+        ouverts = passages(s)
+        if not ouverts or abs(compte) > limite:
+            return
+        for t, tours in (libre if compte == 0 else longer):
+            if ouverts & SENS_HORAIRE[(d + t) % 4]:
+                d = (d + t) % 4
+                compte += tours
+                break
+        etat = (s, d, compte)
+        if etat == reference:
+            return
+        longueur += 1
+        if longueur == puissance:
+            reference, puissance, longueur = etat, puissance * 2, 0
+        s += decalages[d]
+        yield s
+
+
+def chemin_simplifie(flux):
+    """
+    Supprime les boucles d'une marche pour n'en garder qu'un chemin simple (mémoire O(chemin)).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - flux : Un itérable de cases successives (par exemple suivre_mur ou pledge).
+    ------------------------------------------------------------------------------------------------
+    Quand la marche repasse par une case du chemin, tout ce qui a été parcouru depuis est effacé
+    (un aller-retour est une boucle de longueur 2). Le résultat ne passe qu'une fois par chaque
+    case, y compris dans un labyrinthe à boucles ; c'est le plus court chemin si le labyrinthe
+    est parfait.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - La liste des cases du chemin.
+    """
+    pile = []
+    indices = {}
+    for s in flux:
+        i = indices.get(s)
+        if i is not None:
+            for v in pile[i + 1:]:
+                del indices[v]
+            del pile[i + 1:]
+        else:
+            indices[s] = len(pile)
+            pile.append(s)
+    return pile
+
+
+class Marques:
+    """
+    Marques de Trémaux : 2 bits par passage, soit un demi-octet par case.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - l : Largeur du labyrinthe.
+    - bits : bytearray de ceil(n/2) octets ; chaque case porte ses passages DROITE et BAS.
+    """
+
+    def __init__(self, l, n):
+        """Initialise toutes les marques à 0 pour un labyrinthe de n cases et de largeur l."""
+        self.l = l
+        self.bits = bytearray((n + 1) // 2)
+
+    def position(self, s, b):
+        """Retourne l'octet et le décalage des 2 bits du passage b de la case s."""
+        if b == HAUT:
+            s, b = s - self.l, BAS
+        elif b == GAUCHE:
+            s, b = s - 1, DROITE
+        return s >> 1, (s & 1) * 4 + (2 if b == BAS else 0)
+
+    def lire(self, s, b):
+        """Retourne le nombre de marques (0, 1 ou 2) du passage b de la case s."""
+        i, k = self.position(s, b)
+        return (self.bits[i] >> k) & 3
+
+    def ajouter(self, s, b):
+        """Ajoute une marque (au plus 2) au passage b de la case s."""
+        i, k = self.position(s, b)
+        if (self.bits[i] >> k) & 3 < 2:
+            self.bits[i] += 1 << k
+
+
+def tremaux(laby, depart, arrivee):
+    """
+    Résout le labyrinthe par l'algorithme de Trémaux, avec 2 bits de marque par passage.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - laby : Le labyrinthe (parfait ou à boucles).
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    ------------------------------------------------------------------------------------------------
+    Chaque passage emprunté reçoit une marque. En arrivant dans une case déjà visitée par un
+    passage marqué une seule fois, on fait demi-tour ; sinon on prend un passage non marqué,
+    à défaut un passage marqué une fois, jamais un passage marqué deux fois. Une fois la sortie
+    atteinte, les passages marqués exactement une fois forment un chemin de depart à arrivee.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un générateur des cases du chemin trouvé (vide si arrivee est inaccessible).
+    """
+    passages = lecteur_passages(laby)
+    l = laby.l
+    decalage = {HAUT: -l, BAS: l, GAUCHE: -1, DROITE: 1}
+    oppose = {HAUT: BAS, BAS: HAUT, GAUCHE: DROITE, DROITE: GAUCHE}
+    marques = Marques(l, laby.l * laby.h)
+
+    s, entree = depart, 0 # entree : passage par lequel on est arrivé (vu depuis s)
+    while s != arrivee:
+        ouverts = passages(s)
+        choix = 0
+        if entree and marques.lire(s, entree) == 1 and any(
+                ouverts & b and b != entree and marques.lire(s, b) for b in SENS_HORAIRE):
+            choix = entree # case déjà visitée : demi-tour
+        else:
+            for voulu in (0, 1):
+                for b in SENS_HORAIRE:
+                    if ouverts & b and b != entree and marques.lire(s, b) == voulu:
+                        choix = b
+                        break
+                if choix:
+                    break
+            if not choix and entree and marques.lire(s, entree) < 2:
+                choix = entree # cul-de-sac
+        if not choix:
+            return # tout a été exploré deux fois : pas de chemin
+        marques.ajouter(s, choix)
+        s += decalage[choix]
+        entree = oppose[choix]
+
+    s, precedent = depart, None
+    yield s
+    while s != arrivee:
+        ouverts = passages(s)
+        for b in SENS_HORAIRE:
+            v = s + decalage[b]
+            if ouverts & b and v != precedent and marques.lire(s, b) == 1:
+                s, precedent = v, s
+                break
+        yield s
+
+
+def suivre_mur_simplifie(laby, depart, arrivee):
+    """Renvoie le chemin (liste) obtenu par suivi de mur, boucles supprimées, ou None."""
+    chemin = chemin_simplifie(suivre_mur(laby, depart, arrivee))
+    return chemin if chemin and chemin[-1] == arrivee else None
+
+
+def pledge_simplifie(laby, depart, arrivee):
+    """Renvoie le chemin (liste) obtenu par l'algorithme de Pledge, boucles supprimées, ou None."""
+    chemin = chemin_simplifie(pledge(laby, depart, arrivee))
+    return chemin if chemin and chemin[-1] == arrivee else None
+
+
+def tremaux_chemin(laby, depart, arrivee):
+    """Renvoie le chemin (liste) trouvé par Trémaux, ou None."""
+    return list(tremaux(laby, depart, arrivee)) or None
+
+
+METHODES = {
+    "mur": suivre_mur_simplifie,
+    "pledge": pledge_simplifie,
+    "tremaux": tremaux_chemin,
+}
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Solveurs à mémoire constante sur des fichiers de grille.")
+    commandes = parseur.add_subparsers(dest="commande", required=True)
+    gen = commandes.add_parser("generer", help="génère un labyrinthe et l'écrit dans un fichier de grille")
+    gen.add_argument("l", type=int)
+    gen.add_argument("h", type=int)
+    gen.add_argument("fichier")
+    gen.add_argument("--tressage", type=float, default=0)
+    res = commandes.add_parser("resoudre", help="résout un fichier de grille projeté en mémoire")
+    res.add_argument("fichier")
+    res.add_argument("--methode", choices=["mur", "pledge", "tremaux"], default="tremaux")
+    res.add_argument("--depart", type=int, default=0)
+    res.add_argument("--arrivee", type=int, default=None)
+    res.add_argument("--afficher", action="store_true", help="écrit les cases du chemin, une par ligne")
+    args = parseur.parse_args()
+
+    if args.commande == "generer":
+        from labyrinthe import generer_grille, tresser
+        g = generer_grille(args.l, args.h)
+        if args.tressage:
+            tresser(g, args.tressage)
+        sauver_grille(g, args.fichier)
+    else:
+        g = charger_grille(args.fichier)
+        arrivee = g.n - 1 if args.arrivee is None else args.arrivee
+        if args.methode == "mur":
+            flux = suivre_mur(g, args.depart, arrivee)
+        elif args.methode == "pledge":
+            flux = pledge(g, args.depart, arrivee)
+        else:
+            flux = tremaux(g, args.depart, arrivee)
+        longueur = 0
+        derniere = None
+        for s in flux:
+            longueur += 1
+            derniere = s
+            if args.afficher:
+                sys.stdout.write(f"{s}\n")
+        if derniere != arrivee:
+            print("Aucun chemin trouvé", file=sys.stderr)
+        else:
+            print(f"{longueur} cases parcourues ({args.methode})", file=sys.stderr)
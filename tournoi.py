@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from class_graphe import GrapheGrille
+from solveurs import SOLVEURS, PRETRAITEMENTS, SANS_VOISINS
+
+
+GENERATEURS = {
+    "parfait": ("labyrinthe", "generer_grille"),
+    "tressé": ("labyrinthe", "generer_tresse"),
+}
+# quantiles à 97,5 % de la loi de Student, pour les intervalles de confiance à 95 %
+STUDENT = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31, 9: 2.26,
+           10: 2.23, 15: 2.13, 20: 2.09, 30: 2.04}
+MESURES = ("temps_ms", "developpes", "pretraitement_ms", "pretraitement_dev", "memoire_ko")
+
+
+def charger(reference):
+    """Importe et renvoie la fonction désignée par un couple (module, nom)."""
+    module, nom = reference
+    return getattr(import_module(module), nom)
+
+
+class Compteur(GrapheGrille):
+    """
+    Grille partageant les passages d'un labyrinthe, qui compte les sommets développés.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - developpes : Nombre d'appels à voisins, c'est-à-dire de sommets développés.
+    ------------------------------------------------------------------------------------------------
+    Comme c'est un GrapheGrille, les solveurs y suivent le même code (accès direct aux passages)
+    que sur le labyrinthe chronométré : le pic mémoire mesuré est celui de l'exécution réelle.
+    """
+
+    def __init__(self, laby):
+        """Initialise le compteur sur les passages (murs, partagés) du GrapheGrille donné."""
+        super().__init__(laby.l, laby.h, laby.murs)
+        self.developpes = 0
+
+    def voisins(self, s):
+        """Retourne les voisins de s en comptant l'appel."""
+        self.developpes += 1
+        return super().voisins(s)
+
+
+def executer(generateur, taille, repetition, solveurs):
+    """
+    Génère un labyrinthe et le fait résoudre par chacun des solveurs (exécuté dans un processus fils).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - generateur : Nom du générateur (clé de GENERATEURS).
+    - taille : Côté du labyrinthe carré.
+    - repetition : Numéro de répétition ; avec le générateur et la taille, il fixe la graine,
+      si bien que tous les solveurs (et toute reprise) voient le même labyrinthe.
+    - solveurs : Noms des solveurs à exécuter (clés de SOLVEURS).
+    ------------------------------------------------------------------------------------------------
+    Le temps est mesuré sur une première exécution sans instrumentation, puis le nombre de
+    sommets développés et le pic mémoire (tracemalloc) sur une seconde exécution. Le prétraitement
+    éventuel (voir PRETRAITEMENTS) est mesuré à part ; les mesures sans objet valent None.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une liste de dictionnaires, un par solveur.
+    """
+    random.seed(f"{generateur}-{taille}-{repetition}")
+    laby = charger(GENERATEURS[generateur])(taille, taille)
+    depart, arrivee = 0, taille * taille - 1
+    lignes = []
+    for nom in solveurs:
+        resoudre = charger(SOLVEURS[nom])
+        preparer = charger(PRETRAITEMENTS[nom]) if nom in PRETRAITEMENTS else None
+        t0 = time.perf_counter()
+        if preparer:
+            resoudre = preparer(laby)
+        t1 = time.perf_counter()
+        chemin = resoudre(laby, depart, arrivee)
+        t2 = time.perf_counter()
+
+        compteur = Compteur(laby)
+        tracemalloc.start()
+        if preparer:
+            resoudre = preparer(compteur)
+        pretraitement_dev = compteur.developpes
+        compteur.developpes = 0
+        resoudre(compteur, depart, arrivee)
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lignes.append({
+            "generateur": generateur, "taille": taille, "repetition": repetition, "solveur": nom,
+            "temps_ms": 1000 * (t2 - t1),
+            "developpes": None if nom in SANS_VOISINS else compteur.developpes,
+            "pretraitement_ms": 1000 * (t1 - t0) if preparer else None,
+            "pretraitement_dev": pretraitement_dev if preparer else None,
+            "memoire_ko": pic / 1024,
+            "longueur": len(chemin) - 1 if chemin else None,
+        })
+    return lignes
+
+
+def cle(ligne):
+    """Retourne la clé identifiant une exécution dans le fichier de résultats."""
+    return (ligne["generateur"], ligne["taille"], ligne["repetition"], ligne["solveur"])
+
+
+def lire_resultats(fichier):
+    """
+    Lit les résultats déjà enregistrés (une ligne JSON par exécution).
+    ------------------------------------------------------------------------------------------------
+    Une dernière ligne tronquée par une interruption est ignorée.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - La liste des dictionnaires de résultats.
+    """
+    if not os.path.exists(fichier):
+        return []
+    resultats = []
+    with open(fichier, encoding="utf-8") as f:
+        for ligne in f:
+            try:
+                resultats.append(json.loads(ligne))
+            except json.JSONDecodeError:
+                pass
+    return resultats
+
+
+def tournoi(solveurs, generateurs, tailles, repetitions, fichier, processus=None):
+    """
+    Exécute toutes les combinaisons solveur x générateur x taille x répétition sur un pool de processus.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - solveurs, generateurs : Noms des solveurs et générateurs à comparer.
+    - tailles : Côtés des labyrinthes carrés.
+    - repetitions : Nombre de labyrinthes par générateur et par taille.
+    - fichier : Fichier JSONL où chaque résultat est ajouté dès qu'il est obtenu.
+    - processus : Nombre de processus (par défaut, le nombre de cœurs).
+    ------------------------------------------------------------------------------------------------
+    Les exécutions déjà présentes dans le fichier sont sautées : un balayage interrompu
+    reprend là où il s'était arrêté en relançant la même commande.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - La liste de tous les résultats (anciens et nouveaux).
+    """
+    faits = {cle(ligne) for ligne in lire_resultats(fichier)}
+    taches = []
+    for generateur in generateurs:
+        for taille in tailles:
+            for repetition in range(repetitions):
+                restants = [nom for nom in solveurs if (generateur, taille, repetition, nom) not in faits]
+                if restants:
+                    taches.append((generateur, taille, repetition, restants))
+    print(f"{len(faits)} exécutions déjà faites, {sum(len(t[3]) for t in taches)} à lancer")
+
+    if os.path.exists(fichier) and os.path.getsize(fichier) > 0:
+        with open(fichier, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n") # isole une ligne tronquée par une interruption
+
+    with ProcessPoolExecutor(processus) as pool, open(fichier, "a", encoding="utf-8") as sortie:
+        futurs = [pool.submit(executer, *tache) for tache in taches]
+        for i, futur in enumerate(as_completed(futurs), 1):
+            for ligne in futur.result():
+                sortie.write(json.dumps(ligne) + "\n")
+            sortie.flush()
+            print(f"\r{i}/{len(futurs)} labyrinthes", end="", flush=True)
+    print()
+    return lire_resultats(fichier)
+
+
+def intervalle(valeurs):
+    """
+    Calcule la moyenne et la demi-largeur de l'intervalle de confiance à 95 % (loi de Student).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un couple (moyenne, demi-largeur) ; la demi-largeur vaut 0 pour moins de deux valeurs.
+    """
+    moyenne = statistics.fmean(valeurs)
+    if len(valeurs) < 2:
+        return moyenne, 0.0
+    ddl = len(valeurs) - 1
+    t = STUDENT[max(k for k in STUDENT if k <= ddl)] if ddl <= 30 else 1.96
+    return moyenne, t * statistics.stdev(valeurs) / len(valeurs) ** 0.5
+
+
+def tableaux(resultats):
+    """
+    Agrège les résultats par générateur, taille et solveur.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une chaîne de caractères contenant un tableau par générateur, avec pour chaque mesure
+      la moyenne ± la demi-largeur de l'intervalle de confiance à 95 % (« - » si elle est sans
+      objet pour ce solveur).
+    """
+    groupes = {}
+    for ligne in resultats:
+        groupes.setdefault((ligne["generateur"], ligne["taille"], ligne["solveur"]), []).append(ligne)
+    sortie = []
+    for generateur in sorted({g for g, _, _ in groupes}):
+        sortie.append(f"\n== {generateur} ==")
+        sortie.append("{:>7} {:<16} {:>4}".format("taille", "solveur", "n")
+                      + "".join("{:>24}".format(m) for m in MESURES))
+        for (g, taille, solveur), lignes in sorted(groupes.items()):
+            if g != generateur:
+                continue
+            cellules = []
+            for m in MESURES:
+                valeurs = [ligne[m] for ligne in lignes if ligne.get(m) is not None]
+                if not valeurs:
+                    cellules.append("{:>24}".format("-"))
+                    continue
+                moyenne, demi = intervalle(valeurs)
+                cellules.append("{:>24}".format(f"{moyenne:.2f} ± {demi:.2f}"))
+            sortie.append("{:>7} {:<16} {:>4}".format(taille, solveur, len(lignes)) + "".join(cellules))
+    return "\n".join(sortie)
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Tournoi de solveurs sur des lots de labyrinthes.")
+    parseur.add_argument("--solveurs", nargs="+", default=list(SOLVEURS), choices=list(SOLVEURS))
+    parseur.add_argument("--generateurs", nargs="+", default=list(GENERATEURS), choices=list(GENERATEURS))
+    parseur.add_argument("--tailles", nargs="+", type=int, default=[20, 50, 100])
+    parseur.add_argument("--repetitions", type=int, default=10)
+    parseur.add_argument("--processus", type=int, default=None)
+    parseur.add_argument("--sortie", default="tournoi.jsonl")
+    args = parseur.parse_args()
+    resultats = tournoi(args.solveurs, args.generateurs, args.tailles, args.repetitions,
+                        args.sortie, args.processus)
+    print(tableaux(resultats))
@@ -0,0 +1,203 @@
+import json
+import struct
+import sys
+import time
+import zlib
+from algorithmes import dijkstra_etapes, astar_etapes
+from class_graphe import GrapheGrille, passages
+
+
+MAGIQUE = b"LTRC"
+VERSION = 1
+COMPRESSE = 1
+# magique, version, options, l, h, nb d'étapes, longueur du chemin, taille des statistiques
+ENTETE = struct.Struct("<4sBBxxIIIII")
+SECTION = struct.Struct("<I")
+TAILLE_BLOC = 1 << 16
+
+
+def encoder(valeurs):
+    """
+    Encode une suite d'entiers par différences successives en entiers variables (LEB128 zigzag).
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - valeurs : Un itérable d'entiers (numéros de cases).
+    ------------------------------------------------------------------------------------------------
+    Deux cases consécutives d'une exploration sont en général voisines : les différences
+    (±1, ±l) tiennent alors sur un ou deux octets.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un bytearray contenant l'encodage.
+    """
+    sortie = bytearray()
+    precedent = 0
+    for v in valeurs:
+        d = v - precedent
+        precedent = v
+        z = 2 * d if d >= 0 else -2 * d - 1
+        while z >= 0x80:
+            sortie.append((z & 0x7F) | 0x80)
+            z >>= 7
+        sortie.append(z)
+    return sortie
+
+
+def decoder(blocs):
+    """
+    Décode au fil de l'eau une suite encodée par encoder.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - blocs : Un itérable de morceaux d'octets (le découpage peut tomber au milieu d'un entier).
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un générateur des entiers décodés.
+    """
+    precedent = 0
+    z = 0
+    decalage = 0
+    for bloc in blocs:
+        for octet in bloc:
+            z |= (octet & 0x7F) << decalage
+            if octet & 0x80:
+                decalage += 7
+                continue
+            precedent += z >> 1 if z % 2 == 0 else -((z + 1) >> 1)
+            yield precedent
+            z = 0
+            decalage = 0
+
+
+def enregistrer_trace(fichier, laby, etapes, chemin, stats=None, compresser=True):
+    """
+    Écrit une trace d'exploration (ordre des cases visitées, chemin, statistiques) dans un fichier.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - fichier : Chemin du fichier à écrire.
+    - laby : Le labyrinthe exploré ; ses passages sont enregistrés pour pouvoir rejouer la trace.
+    - etapes : Liste des sommets dans l'ordre où ils ont été développés.
+    - chemin : Liste des sommets du chemin trouvé (ou None).
+    - stats : Dictionnaire optionnel de statistiques (sérialisables en JSON).
+    - compresser : Booléen indiquant si les sections sont compressées avec zlib.
+    ------------------------------------------------------------------------------------------------
+    Le fichier contient un en-tête fixe, les statistiques en JSON puis trois sections préfixées
+    par leur taille : les passages (un octet par case), le chemin et les étapes encodés par
+    encoder. Les étapes sont en dernier pour pouvoir être lues en flux.
+    """
+    chemin = chemin or []
+    stats = json.dumps(stats or {}).encode("utf-8")
+    sections = [bytes(passages(laby)), bytes(encoder(chemin)), bytes(encoder(etapes))]
+    if compresser:
+        sections = [zlib.compress(section) for section in sections]
+    with open(fichier, "wb") as f:
+        f.write(ENTETE.pack(MAGIQUE, VERSION, COMPRESSE if compresser else 0,
+                            laby.l, laby.h, len(etapes), len(chemin), len(stats)))
+        f.write(stats)
+        for section in sections:
+            f.write(SECTION.pack(len(section)))
+            f.write(section)
+
+
+class Trace:
+    """
+    Lecteur d'une trace écrite par enregistrer_trace.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - fichier : Chemin du fichier de trace.
+    - l, h : Dimensions du labyrinthe.
+    - nb_etapes : Nombre d'étapes enregistrées.
+    - stats : Dictionnaire des statistiques.
+    - chemin : Liste des sommets du chemin trouvé (vide si aucun).
+    ------------------------------------------------------------------------------------------------
+    Les étapes ne sont jamais chargées en entier : itérer sur la trace les décode bloc par bloc,
+    ce qui permet de l'envoyer directement dans une animation ou un outil d'analyse.
+    """
+
+    def __init__(self, fichier):
+        """
+        Lit l'en-tête, les statistiques et le chemin d'une trace.
+        ------------------------------------------------------------------------------------------------
+        Exceptions :
+        - ValueError si le fichier n'est pas une trace reconnue.
+        """
+        self.fichier = fichier
+        with open(fichier, "rb") as f:
+            magique, version, options, self.l, self.h, self.nb_etapes, nb_chemin, taille_stats = \
+                ENTETE.unpack(f.read(ENTETE.size))
+            if magique != MAGIQUE or version != VERSION:
+                raise ValueError(f"{fichier} n'est pas une trace de version {VERSION}")
+            self.compresse = bool(options & COMPRESSE)
+            self.stats = json.loads(f.read(taille_stats).decode("utf-8"))
+            (taille,) = SECTION.unpack(f.read(SECTION.size))
+            self.debut_murs = f.tell()
+            f.seek(taille, 1)
+            (taille,) = SECTION.unpack(f.read(SECTION.size))
+            section = f.read(taille)
+            self.chemin = list(decoder([zlib.decompress(section) if self.compresse else section]))
+            assert len(self.chemin) == nb_chemin, 'Trace corrompue'
+            (self.taille_etapes,) = SECTION.unpack(f.read(SECTION.size))
+            self.debut_etapes = f.tell()
+
+    def labyrinthe(self):
+        """Retourne le labyrinthe enregistré dans la trace, sous forme de GrapheGrille."""
+        with open(self.fichier, "rb") as f:
+            f.seek(self.debut_murs - SECTION.size)
+            (taille,) = SECTION.unpack(f.read(SECTION.size))
+            section = f.read(taille)
+        return GrapheGrille(self.l, self.h, bytearray(zlib.decompress(section) if self.compresse else section))
+
+    def blocs(self):
+        """Générateur des blocs (décompressés) de la section des étapes."""
+        decompresseur = zlib.decompressobj() if self.compresse else None
+        with open(self.fichier, "rb") as f:
+            f.seek(self.debut_etapes)
+            restant = self.taille_etapes
+            while restant:
+                bloc = f.read(min(TAILLE_BLOC, restant))
+                restant -= len(bloc)
+                yield decompresseur.decompress(bloc) if decompresseur else bloc
+            if decompresseur:
+                yield decompresseur.flush()
+
+    def __iter__(self):
+        """Itère sur les étapes de l'exploration, décodées au fil de la lecture."""
+        return decoder(self.blocs())
+
+    def __len__(self):
+        """Retourne le nombre d'étapes enregistrées."""
+        return self.nb_etapes
+
+
+def enregistrer_resolution(fichier, laby, algorithme, depart, arrivee, compresser=True):
+    """
+    Résout le labyrinthe avec Dijkstra ou A* et enregistre la trace de l'exploration.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - fichier : Chemin du fichier à écrire.
+    - laby : Le graphe représentant le labyrinthe.
+    - algorithme : "dijkstra" ou "astar".
+    - depart, arrivee : Les sommets de départ et d'arrivée.
+    - compresser : Booléen indiquant si les sections sont compressées.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Le dictionnaire des statistiques enregistrées.
+    """
+    resoudre = {"dijkstra": dijkstra_etapes, "astar": astar_etapes}[algorithme]
+    t0 = time.perf_counter()
+    chemin, etapes = resoudre(laby, depart, arrivee)
+    stats = {
+        "algorithme": algorithme,
+        "depart": depart,
+        "arrivee": arrivee,
+        "developpes": len(etapes),
+        "longueur": len(chemin) - 1 if chemin else None,
+        "temps_ms": 1000 * (time.perf_counter() - t0),
+    }
+    enregistrer_trace(fichier, laby, etapes, chemin, stats, compresser)
+    return stats
+
+
+if __name__ == "__main__":
+    for fichier in sys.argv[1:]:
+        trace = Trace(fichier)
+        print(f"{fichier} : labyrinthe {trace.l}x{trace.h}, {len(trace)} étapes, "
+              f"chemin de {len(trace.chemin)} cases, {trace.stats}")
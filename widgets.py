@@ -0,0 +1,85 @@
+import pygame
+
+
+_polices = {}
+_textes = {}
+
+
+def police(taille=36):
+    """
+    Renvoie la police par défaut de la taille donnée, chargée une seule fois.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - taille : Taille de la police en pixels.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Un objet pygame.font.Font mis en cache.
+    """
+    if taille not in _polices:
+        _polices[taille] = pygame.font.Font(None, taille)
+    return _polices[taille]
+
+
+def texte(chaine, couleur=(255, 255, 255), taille=36):
+    """
+    Renvoie la surface d'un texte rendu, mise en cache par texte, couleur et taille.
+    ------------------------------------------------------------------------------------------------
+    Prend en entrée :
+    - chaine : Le texte à afficher.
+    - couleur : La couleur du texte.
+    - taille : Taille de la police en pixels.
+    ------------------------------------------------------------------------------------------------
+    Renvoie :
+    - Une surface Pygame prête à être copiée avec blit.
+    """
+    cle = (chaine, couleur, taille)
+    if cle not in _textes:
+        _textes[cle] = police(taille).render(chaine, True, couleur)
+    return _textes[cle]
+
+
+class Bouton:
+    """
+    Bouton rectangulaire redessiné uniquement lorsque son libellé ou sa couleur change.
+    ------------------------------------------------------------------------------------------------
+    Attributs :
+    - rect : Le rectangle Pygame occupé par le bouton.
+    - decalage : Position (dx, dy) du libellé dans le bouton.
+    - etat : Couple (libellé, couleur) actuellement affiché, None s'il faut redessiner.
+    """
+
+    def __init__(self, rect, decalage=(13, 12)):
+        """
+        Initialise un bouton à la position donnée.
+        ------------------------------------------------------------------------------------------------
+        Paramètres :
+        - rect : Le rectangle Pygame occupé par le bouton.
+        - decalage : Position (dx, dy) du libellé dans le bouton.
+        """
+        self.rect = rect
+        self.decalage = decalage
+        self.etat = None
+
+    def dessiner(self, fenetre, libelle, couleur):
+        """
+        Dessine le bouton si son état a changé depuis le dernier dessin.
+        ------------------------------------------------------------------------------------------------
+        Prend en entrée :
+        - fenetre : La surface Pygame où dessiner.
+        - libelle : Le texte du bouton.
+        - couleur : La couleur de fond du bouton.
+        ------------------------------------------------------------------------------------------------
+        Renvoie :
+        - True si le bouton a été redessiné, False sinon.
+        """
+        etat = (libelle, couleur)
+        if etat == self.etat:
+            return False
+        pygame.draw.rect(fenetre, couleur, self.rect)
+        fenetre.blit(texte(libelle), (self.rect.x + self.decalage[0], self.rect.y + self.decalage[1]))
+        self.etat = etat
+        return True
+
+    def invalider(self):
+        """Force le prochain appel à dessiner à redessiner le bouton."""
+        self.etat = None